@@ -27,6 +27,9 @@ setuptools.setup(
     packages=setuptools.find_packages(where="src"),
     install_requires=REQUIRED,
     package_dir={'': 'src'},
+    entry_points={
+        'console_scripts': ['typeconf=typeconf.__main__:main'],
+    },
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
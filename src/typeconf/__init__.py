@@ -1,28 +1,70 @@
-from collections import defaultdict
-from pydantic import BaseModel, Extra, create_model, ValidationError
-from typing import Dict, ClassVar
+from pydantic import BaseModel, Extra, Field, PrivateAttr, create_model, ValidationError
+from pydantic.main import validate_model
+from pydantic.error_wrappers import ErrorWrapper
+from pydantic.json import pydantic_encoder
+from pydantic.utils import ROOT_KEY
+from typing import Any, Dict, ClassVar, Optional
+from collections.abc import Mapping
+from contextvars import ContextVar
+import copy
+import functools
+import hashlib
+import importlib
 import logging
 import inspect
+import json
+import os
+import weakref
 from typing import Tuple
 from .irconfig import IRConfig
-from .utils import read_file_cfg
+from .utils import read_file_cfg, iter_file_cfgs
+from .cache import LRUCache, memoize_build
+from .stats import AccessStats, spool_stats, flush_stats
 
 
 logger = logging.getLogger(__name__)
 
+# Set while the arguments of the outermost config are already resolved
+_resolved = ContextVar('typeconf_resolved', default=False)
+# (instance, resolved kwargs) passed from __new__ to __init__
+_handover = ContextVar('typeconf_handover', default=None)
+
+# Models created by BaseConfig.build_config
+# keyed by (base class, selected types per field)
+_model_cache = LRUCache(maxsize=256)
+
 
 def resolve(fn):
     """
     Resolves the arguments before running
 
-    TODO this is called multiple times, twice per BaseConfig
-    For a nested config, will be called twice everytime for every nesting
-    even though once is enough.
+    Only the outermost config resolves. The whole tree is resolved at once,
+    nested configs are constructed while the tree is marked as resolved
+    and skip OmegaConf entirely. The arguments resolved in __new__ are
+    handed over to the following __init__.
     """
-    def wrapper(*args, **kwargs):
-        cfg = IRConfig.create(kwargs)
-        cfg = IRConfig.to_container(cfg, resolve=True)
-        return fn(*args, **cfg)
+    @functools.wraps(fn)
+    def wrapper(obj, **kwargs):
+        if _resolved.get():
+            return fn(obj, **kwargs)
+
+        handover = _handover.get()
+        if handover is not None and handover[0] is obj:
+            cfg = handover[1]
+            _handover.set(None)
+        else:
+            cfg = IRConfig.resolve_container(kwargs)
+
+        token = _resolved.set(True)
+        try:
+            result = fn(obj, **cfg)
+        finally:
+            _resolved.reset(token)
+
+        if result is not None:
+            # __new__ returned the instance, __init__ is called next
+            _handover.set((result, cfg))
+        return result
     return wrapper
 
 
@@ -36,7 +78,10 @@ def partial_dict_update(dict1, dict2):
     """
     for key, value in dict2.items():
         if key in dict1:
-            if isinstance(dict1[key], dict) and isinstance(value, dict):
+            if isinstance(dict1[key], Mapping) and isinstance(value, dict):
+                if not isinstance(dict1[key], dict):
+                    # read-only, e.g. a binary config
+                    dict1[key] = dict(dict1[key])
                 partial_dict_update(dict1[key], value)
             else:
                 dict1[key] = value
@@ -44,11 +89,211 @@ def partial_dict_update(dict1, dict2):
             dict1[key] = value
 
 
-class BaseConfig(BaseModel):
+_getattribute = object.__getattribute__
+
+
+def _count_access(self, item):
+    try:
+        path = _getattribute(self, '_paths').get(item)
+    except AttributeError:
+        # not initialized yet
+        path = None
+    if path is not None:
+        counts = _getattribute(self, '_stats').counts
+        count = counts.get(path)
+        if count is None:
+            _record_first(_getattribute(self, '_stats'), path)
+        else:
+            counts[path] = count + 1
+    return _getattribute(self, item)
+
+
+def _first_access(self, item):
+    try:
+        path = _getattribute(self, '_paths').get(item)
+    except AttributeError:
+        # not initialized yet
+        path = None
+    if path is not None:
+        stats = _getattribute(self, '_stats')
+        if path not in stats.counts:
+            _record_first(stats, path)
+    return _getattribute(self, item)
+
+
+def _record_first(stats, path):
+    stats.unused.discard(path)
+    stats.counts[path] = 1
+    if stats.log is not None:
+        stats.log.first_access(path)
+
+
+# __getattribute__ installed per access tracking mode
+_access_hooks = {
+    'count': _count_access,
+    'first': _first_access,
+    'off': object.__getattribute__,
+}
+
+
+def _lazy_access(hook):
+    def __getattribute__(self, item):
+        try:
+            pending = object.__getattribute__(self, '_pending')
+        except AttributeError:
+            # not initialized yet
+            pending = None
+        if pending and item in pending:
+            object.__getattribute__(self, '_materialize')(item)
+        return hook(self, item)
+    return __getattribute__
+
+
+# __getattribute__ installed per access tracking mode for lazy configs
+_lazy_access_hooks = {mode: _lazy_access(hook) for mode, hook in _access_hooks.items()}
+
+
+def _selection(origin, values):
+    """
+    Names of the options selected in values, as expected by build_config.
+    """
+    # don't track
+    return {key: {'name': values[key].__dict__['name']}
+            for key in origin.__fields__
+            if isinstance(values.get(key), SelectConfig)}
+
+
+def _rebuild(origin, selection, values, fields_set, pending, stats=None, prefix=''):
+    """
+    Recreates a config without resolving or validating.
+
+    The model is rebuilt from the importable origin class
+    and the names of the selected options. Access is recorded
+    in stats at prefix if given.
+    """
+    cls = origin.build_config(selection) if selection else origin
+    obj = object.__new__(cls)
+    object.__setattr__(obj, '__dict__', values)
+    object.__setattr__(obj, '__fields_set__', fields_set)
+    obj._init_private_attributes()
+    # copies materialize on their own
+    obj._pending = dict(pending) if pending else pending
+    if stats is not None:
+        obj._stats = stats
+        obj._prefix = prefix
+    obj._attach()
+    return obj
+
+
+def _drop_parent(parents, key, ref):
+    # the id may be taken by a new parent already
+    if parents.get(key) is ref:
+        del parents[key]
+
+
+def _uses_values(fn):
+    """
+    Whether a validator gets the values of the other fields.
+    """
+    params = inspect.signature(fn).parameters.values()
+    return any(p.name == 'values' or p.kind is p.VAR_KEYWORD for p in params)
+
+
+def _canonical(value):
+    """
+    JSON compatible form of a field value for fingerprinting.
+    """
+    if isinstance(value, BaseConfig):
+        return {'__fingerprint__': value.fingerprint()}
+    if isinstance(value, Mapping):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted((_canonical(v) for v in value), key=_dumps_canonical)
+    if inspect.isclass(value) or inspect.isroutine(value):
+        # e.g. activation functions, by their import path
+        return {'__callable__': f'{value.__module__}.{value.__qualname__}'}
+    return value
+
+
+def _dumps_canonical(value):
+    return json.dumps(value, sort_keys=True, separators=(',', ':'), default=pydantic_encoder)
+
+
+def _parse_chunk(cls, items):
+    """
+    Constructs every item, returns the config or the raised exception.
+    """
+    results = []
+    for item in items:
+        try:
+            results.append(cls(**item))
+        except ValidationError as e:
+            results.append(_portable_error(e))
+        except Exception as e:
+            results.append(e)
+    return results
+
+
+def _portable_error(error):
+    """
+    Rebuilds a ValidationError against the declared config classes,
+    the models built per selection can't be pickled to the parent.
+    """
+    def portable(errors):
+        if isinstance(errors, ErrorWrapper):
+            if isinstance(errors.exc, ValidationError):
+                return ErrorWrapper(_portable_error(errors.exc), errors.loc_tuple())
+            return errors
+        return [portable(e) for e in errors]
+
+    model = error.model
+    model = model.__dict__.get('__typeconf_origin__', model)
+    return ValidationError(portable(error.raw_errors), model)
+
+
+class _WeakRefModel(BaseModel):
+    # nested configs reference their parents weakly,
+    # defined here as BaseConfig takes underscore names as private attributes
+    __slots__ = ('__weakref__', )
+
+
+class BaseConfig(_WeakRefModel):
     """
     https://github.com/samuelcolvin/pydantic/issues/2130
+
+    With Config.lazy, nested configs given as dicts are kept raw and
+    validated on first access. validate_all validates them at once.
+    The post root validators run once no nested config is pending.
+
+    Field access is tracked per instance. The mode is set through
+    Config.track_access or set_access_tracking:
+        count: count every access
+        first: only record the first access
+        off: no tracking, no __getattribute__ override
+    Counts are kept per tree in one AccessStats keyed by dotted path.
+    A nested config held by several configs reports to the tree it
+    was attached to first.
+    Copies and variants created by evolve record their own access.
+
+    With Config.incremental_assignment, assigning a field validates only
+    that field, the fields with validators depending on it and the root
+    validators. Nested configs keep weak references to the configs
+    holding them, assignments reset the cached fingerprints upwards.
     """
-    _field_access = defaultdict(int)
+    _stats : AccessStats = PrivateAttr(default_factory=AccessStats)
+    # path of this config in the tree of _stats, e.g. optimizer.
+    _prefix : str = PrivateAttr(default='')
+    # field name -> full path, see _field_paths
+    _paths : Dict[str, str] = PrivateAttr(default_factory=dict)
+    _fingerprint : Optional[str] = PrivateAttr(default=None)
+    # whether the tree below is immutable, see _frozen_tree
+    _frozen : Optional[bool] = PrivateAttr(default=None)
+    # raw values of lazy fields not validated yet
+    _pending : Optional[Dict[str, Any]] = PrivateAttr(default=None)
+    # id -> weak reference of the configs holding this one
+    _parents : Dict[int, Any] = PrivateAttr(default_factory=dict)
 
     # TODO what happens when using multipe classes
     _parser : ClassVar = None
@@ -56,10 +301,324 @@ class BaseConfig(BaseModel):
     class Config:
         underscore_attrs_are_private = True
         extra = Extra.forbid
+        track_access = 'count'
+        lazy = False
+        incremental_assignment = False
 
     @resolve
     def __init__(self, **kwargs):
-        super().__init__(**kwargs)
+        if self.__config__.lazy:
+            self._init_lazy(kwargs)
+        else:
+            super().__init__(**kwargs)
+        self._attach()
+
+    def _attach(self):
+        """
+        Registers the fields in the access stats and adopts nested configs.
+        """
+        self._paths = self._field_paths(self._prefix)
+        names = self.__fields__
+        if isinstance(self, SelectConfig):
+            # read by build_config, not through access
+            names = [name for name in names if name != 'name']
+        self._stats.add_fields(self._prefix, names)
+        # don't track
+        values = super().__getattribute__('__dict__')
+        for name, value in values.items():
+            if isinstance(value, BaseConfig):
+                self._adopt(name, value)
+
+    def _adopt(self, name, child):
+        child._add_parent(self)
+        if child._prefix == '' and child._stats is not self._stats:
+            child._bind_stats(self._stats, f'{self._prefix}{name}.')
+
+    @classmethod
+    def _field_paths(cls, prefix):
+        """
+        Full path per field below prefix, shared by all instances.
+        """
+        cache = cls.__dict__.get('__typeconf_paths__')
+        if cache is None:
+            cache = cls.__typeconf_paths__ = {}
+        paths = cache.get(prefix)
+        if paths is None:
+            paths = cache[prefix] = {name: prefix + name for name in cls.__fields__}
+        return paths
+
+    def _bind_stats(self, stats, prefix):
+        """
+        Moves the access counts of this tree into stats below prefix.
+        """
+        old = self._stats
+        stats.merge(old, prefix)
+        stack = [self]
+        while stack:
+            cfg = stack.pop()
+            cfg._stats = stats
+            cfg._prefix = prefix + cfg._prefix
+            cfg._paths = cfg._field_paths(cfg._prefix)
+            for value in object.__getattribute__(cfg, '__dict__').values():
+                if isinstance(value, BaseConfig) and value._stats is old:
+                    stack.append(value)
+
+    def _add_parent(self, parent):
+        # by id, configs are unhashable and equal configs are different parents
+        key = id(parent)
+        if key not in self._parents:
+            self._parents[key] = weakref.ref(parent, functools.partial(_drop_parent, self._parents, key))
+
+    def _invalidate(self):
+        """
+        Drops the cached fingerprints of this config and all configs holding it.
+        """
+        stack = [self]
+        seen = set()
+        while stack:
+            cfg = stack.pop()
+            if id(cfg) in seen:
+                continue
+            seen.add(id(cfg))
+            cfg._fingerprint = None
+            for ref in list(cfg._parents.values()):
+                parent = ref()
+                if parent is not None:
+                    stack.append(parent)
+
+    def __setattr__(self, name, value):
+        cls = type(self)
+        if name not in cls.__fields__:
+            # private attributes and errors
+            return super().__setattr__(name, value)
+
+        if cls.__config__.incremental_assignment:
+            self._assign_incremental(name, value)
+        else:
+            super().__setattr__(name, value)
+
+        if self._pending:
+            self._pending.pop(name, None)
+        # don't track
+        value = super().__getattribute__('__dict__')[name]
+        if isinstance(value, BaseConfig):
+            self._adopt(name, value)
+        self._invalidate()
+
+    def _assign_incremental(self, name, value):
+        cls = type(self)
+        config = cls.__config__
+        field = cls.__fields__[name]
+        if not config.allow_mutation or config.frozen:
+            raise TypeError(f'"{cls.__name__}" is immutable and does not support item assignment')
+        if field.final or not field.field_info.allow_mutation:
+            raise TypeError(f'"{name}" has allow_mutation set to False and cannot be assigned')
+
+        # don't track
+        values = super().__getattribute__('__dict__')
+        new_values = {**values, name: value}
+        for validator in cls.__pre_root_validators__:
+            try:
+                new_values = validator(cls, new_values)
+            except (ValueError, TypeError, AssertionError) as exc:
+                raise ValidationError([ErrorWrapper(exc, loc=ROOT_KEY)], cls)
+
+        others = {k: v for k, v in values.items() if k != name}
+        value, error = field.validate(new_values[name], others, loc=name, cls=cls)
+        if error:
+            raise ValidationError([error], cls)
+        new_values[name] = value
+
+        errors = []
+        new_values = cls._validate_dependents((name, ), new_values, errors, self._pending)
+        if errors:
+            raise ValidationError(errors, cls)
+
+        object.__setattr__(self, '__dict__', new_values)
+        self.__fields_set__.add(name)
+
+    @classmethod
+    def _validate_dependents(cls, names, values, errors, pending=None, root=True):
+        """
+        Validates the fields depending on the changed ones again and,
+        with root, runs the post root validators. Appends to errors,
+        returns the new values.
+        """
+        pending = pending or {}
+        dependents = set()
+        for name in names:
+            dependents.update(cls._dependent_fields().get(name, ()))
+        for dependent in cls.__fields__:
+            if dependent not in dependents or dependent in names \
+                    or dependent in pending or dependent not in values:
+                continue
+            others = {k: v for k, v in values.items() if k != dependent}
+            value, error = cls.__fields__[dependent].validate(
+                values[dependent], others, loc=dependent, cls=cls)
+            if error:
+                errors.append(error)
+            values[dependent] = value
+
+        if not root:
+            return values
+        for skip_on_failure, validator in cls.__post_root_validators__:
+            if skip_on_failure and errors:
+                continue
+            try:
+                values = validator(cls, values)
+            except (ValueError, TypeError, AssertionError) as exc:
+                errors.append(ErrorWrapper(exc, loc=ROOT_KEY))
+        return values
+
+    @classmethod
+    def _dependent_fields(cls):
+        """
+        Per field, the later fields with validators using the values.
+        """
+        dependents = cls.__dict__.get('__typeconf_dependents__')
+        if dependents is None:
+            dependents = {}
+            before = []
+            for name, f in cls.__fields__.items():
+                if any(_uses_values(v.func) for v in (f.class_validators or {}).values()):
+                    for other in before:
+                        dependents.setdefault(other, []).append(name)
+                before.append(name)
+            cls.__typeconf_dependents__ = dependents
+        return dependents
+
+    def _init_lazy(self, kwargs):
+        cls = type(self)
+        values, fields_set, error = validate_model(cls._lazy_shell(), kwargs)
+        if error:
+            raise ValidationError(error.raw_errors, cls)
+
+        pending = {}
+        errors = []
+        for name in cls._config_fields():
+            if name not in kwargs:
+                continue
+            if isinstance(kwargs[name], Mapping):
+                # copied by resolve already
+                pending[name] = kwargs[name]
+                continue
+            # not a dict, nothing to save
+            value, error = cls.__fields__[name].validate(kwargs[name], values, loc=name, cls=cls)
+            if error:
+                errors.append(error)
+            values[name] = value
+        if not pending:
+            # left out of the shell
+            values = cls._validate_dependents((), values, errors)
+        if errors:
+            raise ValidationError(errors, cls)
+
+        object.__setattr__(self, '__dict__', values)
+        object.__setattr__(self, '__fields_set__', fields_set)
+        self._init_private_attributes()
+        self._pending = pending
+
+    @classmethod
+    def _config_fields(cls):
+        """
+        Names of fields holding a single config.
+        """
+        return [key for key, f in cls.__fields__.items()
+                if inspect.isclass(f.outer_type_) and issubclass(f.outer_type_, BaseConfig)]
+
+    @classmethod
+    def _lazy_shell(cls):
+        """
+        Model accepting anything for config fields.
+
+        Their validators and the post root validators expect configs,
+        they run when the fields are validated, see _materialize.
+        """
+        shell = cls.__dict__.get('__typeconf_shell__')
+        if shell is None:
+            fields = {}
+            for name in cls._config_fields():
+                f = cls.__fields__[name]
+                if f.required:
+                    fields[name] = (Any, ...)
+                elif f.default_factory is not None:
+                    fields[name] = (Any, Field(default_factory=f.default_factory))
+                else:
+                    fields[name] = (Any, f.default)
+            shell = create_model(cls.__name__, __base__=cls, **fields)
+            for name in fields:
+                f = shell.__fields__[name]
+                f.class_validators = {}
+                f.populate_validators()
+            shell.__post_root_validators__ = []
+            cls.__typeconf_shell__ = shell
+        return shell
+
+    def _materialize(self, name):
+        cls = type(self)
+        pending = self._pending
+        field = cls.__fields__[name]
+        # don't track
+        values = super().__getattribute__('__dict__')
+        # resolved by the outermost config already
+        token = _resolved.set(True)
+        try:
+            value, error = field.validate(pending[name], values, loc=name, cls=cls)
+        finally:
+            _resolved.reset(token)
+        if error:
+            raise ValidationError([error], cls)
+        # the validators depending on it saw the raw value
+        errors = []
+        rest = pending.keys() - {name}
+        values = cls._validate_dependents((name, ), {**values, name: value}, errors,
+                                          rest, root=not rest)
+        if errors:
+            raise ValidationError(errors, cls)
+        del pending[name]
+        object.__setattr__(self, '__dict__', values)
+        if isinstance(value, BaseConfig):
+            self._adopt(name, value)
+
+    def _copy_and_set_values(self, values, fields_set, *, deep):
+        """
+        Used by copy and when validating an instance.
+
+        As in pydantic, without calling __new__ which builds the model.
+        """
+        if deep:
+            values = copy.deepcopy(values)
+        obj = object.__new__(type(self))
+        object.__setattr__(obj, '__dict__', values)
+        object.__setattr__(obj, '__fields_set__', fields_set)
+        for name in self.__private_attributes__:
+            value = getattr(self, name)
+            if deep:
+                value = copy.deepcopy(value)
+            object.__setattr__(obj, name, value)
+        # the copy is not held by the parents of this config
+        obj._parents = {}
+        # and records its own access
+        obj._stats = AccessStats()
+        obj._prefix = ''
+        obj._attach()
+        if obj._pending and not deep:
+            # copies materialize on their own
+            obj._pending = dict(obj._pending)
+        return obj
+
+    def validate_all(self):
+        """
+        Validates all lazy fields, recursively.
+        """
+        if self._pending:
+            for name in list(self._pending):
+                self._materialize(name)
+        for name in self.__fields__:
+            # don't track
+            value = super().__getattribute__(name)
+            if isinstance(value, BaseConfig):
+                value.validate_all()
 
     @resolve
     def __new__(cls, **kwargs):
@@ -67,33 +626,286 @@ class BaseConfig(BaseModel):
         obj = super().__new__(cls)
         return obj
 
-    def __getattribute__(self, item):
-        if not item.startswith('_') and item in self.__fields__:
-            self._field_access[item] += 1
-        return super().__getattribute__(item)
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._install_access_tracking()
+
+    @classmethod
+    def _install_access_tracking(cls):
+        mode = cls.__config__.track_access
+        if mode not in _access_hooks:
+            raise ValueError("Unknown access tracking mode %s" % mode)
+        if cls.__config__.lazy:
+            cls.__getattribute__ = _lazy_access_hooks[mode]
+        else:
+            cls.__getattribute__ = _access_hooks[mode]
+
+    @classmethod
+    def set_access_tracking(cls, mode):
+        """
+        Sets the tracking mode for this class and all subclasses
+        not setting their own. Called on BaseConfig it is global.
+        """
+        if mode not in _access_hooks:
+            raise ValueError("Unknown access tracking mode %s" % mode)
+        cls.__config__.track_access = mode
+        stack = [cls]
+        while stack:
+            c = stack.pop()
+            c._install_access_tracking()
+            stack.extend(c.__subclasses__())
+
+    def __reduce__(self):
+        cls = type(self)
+        origin = cls.__dict__.get('__typeconf_origin__')
+        selection = None
+        if origin is not None:
+            selection = _selection(origin, self.__dict__)
+        else:
+            origin = cls
+        args = (origin, selection, self.__dict__, self.__fields_set__, self._pending)
+        if self._stats.spool is not None:
+            # keep recording for the tree in other processes
+            args += (self._stats, self._prefix)
+        return (_rebuild, args)
+
+    def collect_stats(self, spool_dir=None):
+        """
+        Collects the access of configs sent to other processes.
+
+        Copies of this tree pickled to or forked into workers record
+        into the spool directory when the worker exits, see
+        typeconf.stats. get_stats and find_unused merge them and
+        delete the merged files. Returns the spool directory, a temporary
+        one if not given, which is removed at exit.
+        """
+        if spool_dir is None:
+            import atexit
+            import shutil
+            import tempfile
+            spool_dir = tempfile.mkdtemp(prefix='typeconf-stats-')
+            atexit.register(shutil.rmtree, spool_dir, ignore_errors=True)
+        spool_stats(self._stats, spool_dir)
+        return spool_dir
+
+    def dump_stats(self, path):
+        """
+        Writes the access counts of every field with the class
+        and selected option holding it, read by typeconf stats.
+        """
+        cls = type(self)
+        origin = cls.__dict__.get('__typeconf_origin__', cls)
+        dump = {
+            'version': 1,
+            'schema': f'{origin.__module__}.{origin.__qualname__}',
+            'fields': self._usage(),
+        }
+        with open(path, 'w') as f:
+            json.dump(dump, f)
+
+    def _usage(self):
+        counts = self.get_stats()
+        usage = []
+        stack = [(self, '')]
+        while stack:
+            cfg, prefix = stack.pop()
+            cls = type(cfg)
+            origin = cls.__dict__.get('__typeconf_origin__', cls)
+            owner = f'{origin.__module__}.{origin.__qualname__}'
+            # don't track
+            values = object.__getattribute__(cfg, '__dict__')
+            option = cls._sanitize_fn(values['name']) if isinstance(cfg, SelectConfig) else None
+            for name in cls.__fields__:
+                if option is not None and name == 'name':
+                    # read by build_config, not through access
+                    continue
+                path = prefix + name
+                usage.append({'path': path, 'owner': owner, 'option': option,
+                              'count': counts.get(path, 0)})
+                # pending lazy configs were never accessed
+                if isinstance(values.get(name), BaseConfig):
+                    stack.append((values[name], path + '.'))
+        return usage
+
+    def log_access(self, path, interval=10.0, buffer_size=10000):
+        """
+        Appends the access of the whole tree to a JSON Lines log
+        from a background thread, see typeconf.stats.AccessLog.
+
+        Returns the log, close it to write the last record.
+        """
+        from .stats import AccessLog
+        if self._stats.log is not None:
+            self._stats.log.close()
+        return AccessLog(self._stats, path, interval, buffer_size)
+
+    def evolve(self, **changes):
+        """
+        New config with the values at the given dotted paths changed.
+            cfg.evolve(**{"optimizer.lr": 0.1})
+
+        Untouched nested configs are copied, immutable ones without
+        validating and keeping their cached fingerprints.
+        Only the changed fields and the fields with validators using
+        them are validated, then the post root validators run.
+        Changing the name of a selected option builds that option from
+        the changes given for it.
+        """
+        cls = type(self)
+        direct = {}
+        nested = {}
+        for path, value in changes.items():
+            name, _, rest = path.partition('.')
+            if rest:
+                nested.setdefault(name, {})[rest] = value
+            else:
+                direct[name] = value
+
+        if isinstance(self, SelectConfig) and 'name' in direct \
+                and cls._sanitize_fn(direct['name']) != cls._sanitize_fn(self.__dict__['name']):
+            if nested:
+                raise ValueError("Cannot change nested values when changing the option")
+            return cls.build_config(direct)(**direct)
+
+        for name in nested.keys() | direct.keys():
+            if name not in self.__fields__:
+                raise ValueError(f'"{cls.__name__}" object has no field "{name}"')
+
+        pending = dict(self._pending) if self._pending else {}
+        for name in nested.keys() & pending.keys():
+            self._materialize(name)
+        for name in nested.keys() | direct.keys():
+            pending.pop(name, None)
+
+        values = dict(self.__dict__)
+        for name, subchanges in nested.items():
+            if name in direct:
+                raise ValueError(f"{name} is changed as a whole and partially")
+            if not isinstance(values.get(name), BaseConfig):
+                raise ValueError(f"{name} is not a config")
+            values[name] = values[name].evolve(**subchanges)
+        for name, value in values.items():
+            if not isinstance(value, BaseConfig) or name in nested:
+                continue
+            if value._frozen_tree():
+                # recorded in the stats of the variant
+                values[name] = value._share()
+            else:
+                # assigning to the variant must not change this config
+                values[name] = value.evolve()
+
+        # the fields of the origin accept any option
+        origin = cls.__dict__.get('__typeconf_origin__', cls)
+        errors = []
+        # in field order, validators see the changes before them
+        for name in origin.__fields__:
+            if name not in direct:
+                continue
+            others = {k: v for k, v in values.items() if k != name}
+            value, error = origin.__fields__[name].validate(direct[name], others, loc=name, cls=origin)
+            if error:
+                errors.append(error)
+            values[name] = value
+        values = origin._validate_dependents(direct.keys() | nested.keys(), values, errors, pending)
+        if errors:
+            raise ValidationError(errors, cls)
+
+        fields_set = self.__fields_set__ | direct.keys() | nested.keys()
+        # a variant is a run of its own
+        return _rebuild(origin, _selection(origin, values), values, fields_set, pending or None)
+
+    def _frozen_tree(self):
+        """
+        Whether this config and all configs below it are immutable.
+        """
+        config = self.__config__
+        if config.allow_mutation and not config.frozen:
+            return False
+        if self._pending:
+            # may become anything
+            return False
+        if self._frozen is None:
+            # don't track
+            values = super().__getattribute__('__dict__')
+            self._frozen = all(value._frozen_tree() for value in values.values()
+                               if isinstance(value, BaseConfig))
+        return self._frozen
+
+    def _share(self):
+        """
+        Copy of an immutable tree sharing the field values,
+        each config records its own access.
+        """
+        # don't track
+        values = {name: value._share() if isinstance(value, BaseConfig) else value
+                  for name, value in super().__getattribute__('__dict__').items()}
+        return self._copy_and_set_values(values, set(self.__fields_set__), deep=False)
+
+    def fingerprint(self) -> str:
+        """
+        Stable hash over the class and the resolved field values.
+
+        Independent of the order of fields and dict keys. Selected
+        options are covered by their class and name, classes and
+        functions by their import path. Cached on
+        immutable configs.
+        """
+        if self._fingerprint is not None:
+            return self._fingerprint
+        self.validate_all()
+
+        cls = type(self)
+        origin = cls.__dict__.get('__typeconf_origin__', cls)
+        # don't track
+        values = super().__getattribute__('__dict__')
+        data = {
+            'class': f'{origin.__module__}.{origin.__qualname__}',
+            'fields': {name: _canonical(values[name]) for name in self.__fields__ if name in values},
+        }
+        if isinstance(self, SelectConfig):
+            data['fields']['name'] = cls._sanitize_fn(values['name'])
+        try:
+            dumped = _dumps_canonical(data)
+        except TypeError as e:
+            for name, value in data['fields'].items():
+                try:
+                    _dumps_canonical(value)
+                except TypeError:
+                    raise TypeError(f'Cannot fingerprint field "{name}" of "{cls.__name__}": {e}')
+            raise
+        fingerprint = hashlib.sha256(dumped.encode('utf-8')).hexdigest()
+        if not self.__config__.allow_mutation or self.__config__.frozen:
+            self._fingerprint = fingerprint
+        return fingerprint
+
+    def dump_binary(self, path):
+        """
+        Writes the config in the binary format, see typeconf.binary.
+
+        It is read back lazily with read_file_cfg.
+        """
+        from .binary import dump_binary_cfg
+        dump_binary_cfg(json.loads(self.json()), path)
 
     def __getitem__(self, item):
         return self.__getattribute__(item)
 
     def get_stats(self) -> Dict[str, int]:
-        stats = dict(self._field_access)
-
-        for name, field in self.__fields__.items():
-            # don't track
-            f = super().__getattribute__(name)
-            if isinstance(f, BaseConfig):
-                sub_stats = f.get_stats()
-                def flatten(d):
-                    for key, value in d.items():
-                        stats[field.name + '.' + key] = value
-                flatten(sub_stats)
-        return stats
+        """
+        Snapshot of the access counts by dotted path, e.g. optimizer.lr
+        """
+        return self._stats.snapshot(self._prefix)
 
     def find_unused(self):
-        return set(self.__fields__.keys()) - set(self._field_access.keys())
+        """
+        Dotted paths of the fields never accessed, including nested configs.
+        """
+        return self._stats.find_unused(self._prefix)
 
     @classmethod
     def build_config(cls, cfg):
+        # models built here are rebuilt from the class they were built from
+        cls = cls.__dict__.get('__typeconf_origin__', cls)
         dynamic_configs = {}
         for key, f in cls.__fields__.items():
             if inspect.isclass(f.outer_type_) and issubclass(f.outer_type_, SelectConfig):
@@ -107,18 +919,74 @@ class BaseConfig(BaseModel):
                 dynamic_configs[key] = (config, ...)
 
         if len(dynamic_configs) > 0:
-            return create_model(
-                cls.__name__,
-                __base__=cls,
-                **dynamic_configs
-            )
+            key = (cls, tuple((k, v[0]) for k, v in dynamic_configs.items()))
+            return _model_cache.get_or_create(key, lambda: cls._create_model(dynamic_configs))
         else:
             return cls
 
+    @classmethod
+    def _create_model(cls, dynamic_configs):
+        model = create_model(
+            cls.__name__,
+            __base__=cls,
+            **dynamic_configs
+        )
+        model.__typeconf_origin__ = cls
+        return model
+
+    @classmethod
+    def clear_model_cache(cls):
+        """
+        Drops all models created by build_config.
+        """
+        _model_cache.clear()
+
+    @classmethod
+    def model_cache_info(cls):
+        return _model_cache.info()
+
+    @classmethod
+    def set_model_cache_size(cls, maxsize):
+        _model_cache.resize(maxsize)
+
+    @classmethod
+    def parse_many(cls, items, workers=None, chunksize=16):
+        """
+        Constructs a config from every dict in items.
+
+        Yields the config or the exception raised for it, in input order.
+        Items selecting the same options share one compiled model.
+        With workers, chunks of items are validated in a process pool,
+        at most 2 * workers chunks are in flight.
+        """
+        if not workers:
+            for item in items:
+                yield from _parse_chunk(cls, [item])
+            return
+
+        from concurrent.futures import ProcessPoolExecutor
+        from collections import deque
+        from itertools import islice
+        items = iter(items)
+        pending = deque()
+        with ProcessPoolExecutor(workers) as pool:
+            while True:
+                chunk = list(islice(items, chunksize))
+                if chunk:
+                    pending.append(pool.submit(_parse_chunk, cls, chunk))
+                if not pending:
+                    break
+                if not chunk or len(pending) >= 2 * workers:
+                    yield from pending.popleft().result()
+
     @classmethod
     def _create_parser(cls):
         from typeconf import cli
-        parser = cli.Parser.from_config(cls)
+        cache_dir = os.environ.get('TYPECONF_CACHE_DIR')
+        if cache_dir:
+            parser = cli.Parser.from_config_cached(cls, cache_dir)
+        else:
+            parser = cli.Parser.from_config(cls)
         parser.add_argument('--config_path')
         parser.add_argument('--presets')
         parser.add_argument('--system')
@@ -139,7 +1007,7 @@ class BaseConfig(BaseModel):
         system_path = args.get('system')
 
         if config_path is not None:
-            kwargs = read_file_cfg(config_path)
+            kwargs = dict(read_file_cfg(config_path))
             args.pop('config_path')
         else:
             kwargs = {}
@@ -161,6 +1029,9 @@ class BaseConfig(BaseModel):
         return kwargs
 
 
+BaseConfig._install_access_tracking()
+
+
 def all_lower(string):
     return string.lower()
 
@@ -175,6 +1046,7 @@ class SelectConfig(BaseConfig):
         """
         Register a config.
         Namespace is per class.
+        Replaces options registered lazily under the same name.
         """
         if cls._registered is None:
             cls._registered = {}
@@ -186,13 +1058,47 @@ class SelectConfig(BaseConfig):
                 raise RuntimeError("Please inherit and register from the parent config class")
 
             for name in names:
-                if cls._sanitize_fn(name) in cls._registered:
-                    raise ValueError("%s has already been registered: %s" % (name, cls._registered[name]))
-                cls._registered[cls._sanitize_fn(name)] = obj
+                name = cls._sanitize_fn(name)
+                registered = cls._registered.get(name)
+                if registered is not None and not isinstance(registered, str):
+                    raise ValueError("%s has already been registered: %s" % (name, registered))
+                cls._registered[name] = obj
             logger.debug(cls._registered)
             return obj
         return _register
 
+    @classmethod
+    def register_lazy(cls, name, path):
+        """
+        Register a config by its import path, e.g. package.module.Config
+        The module is imported when the option is selected.
+        """
+        if cls._registered is None:
+            cls._registered = {}
+
+        key = cls._sanitize_fn(name)
+        registered = cls._registered.get(key)
+        if registered is not None:
+            if isinstance(registered, str):
+                registered_path = registered
+            else:
+                registered_path = f'{registered.__module__}.{registered.__qualname__}'
+            if registered_path == path:
+                return
+            raise ValueError("%s has already been registered: %s" % (name, registered))
+        cls._registered[key] = path
+
+    @classmethod
+    def _import_option(cls, name, path):
+        module_name, _, attr = path.rpartition('.')
+        module = importlib.import_module(module_name)
+        option = cls._registered[name]
+        if isinstance(option, str):
+            # not registered on import of the module
+            cls.register(name)(getattr(module, attr))
+            option = cls._registered[name]
+        return option
+
     @classmethod
     def build_config(cls, cfg):
         name = cfg.get('name')
@@ -201,10 +1107,12 @@ class SelectConfig(BaseConfig):
 
         name = cls._sanitize_fn(cfg['name'])
 
-        if name not in cls._registered:
+        if cls._registered is None or name not in cls._registered:
             raise ValueError("Unknown option for %s: %s" % (cls.__name__, cfg['name']))
-        cls = cls._registered[name]
-        return cls._build_config(cfg)
+        option = cls._registered[name]
+        if isinstance(option, str):
+            option = cls._import_option(name, option)
+        return option._build_config(cfg)
 
     @classmethod
     def _build_config(cls, cfg):
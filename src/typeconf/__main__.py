@@ -0,0 +1,40 @@
+"""
+typeconf command line
+
+    typeconf stats [-j WORKERS] [--rare FRACTION] [--json] PATH...
+"""
+import argparse
+import json
+import sys
+
+
+def stats(args):
+    from .report import build_index, unused_fields, format_report
+    index = build_index(args.paths, workers=args.workers)
+    report = unused_fields(index, rare=args.rare)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(format_report(report, rare=args.rare))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='typeconf')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    parser_stats = commands.add_parser(
+        'stats', help='report fields never or rarely used over dumps of BaseConfig.dump_stats')
+    parser_stats.add_argument('paths', nargs='+', help='dump files or directories holding them')
+    parser_stats.add_argument('-j', '--workers', type=int, default=None,
+                              help='index files in parallel processes')
+    parser_stats.add_argument('--rare', type=float, default=0.05,
+                              help='fraction of runs below which a field is rarely used')
+    parser_stats.add_argument('--json', action='store_true', help='print the report as json')
+    parser_stats.set_defaults(fn=stats)
+
+    args = parser.parse_args(argv)
+    args.fn(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
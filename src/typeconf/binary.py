@@ -0,0 +1,136 @@
+"""
+Binary format for resolved configs
+
+Nodes are decoded lazily from a memory-mapped file, only the keys
+along an accessed path are read.
+
+Layout, little endian:
+    header: magic, u64 offset of the root node
+    dict:   b'd', u32 number of items, per item u32 key length, key, u64 offset of value
+    leaf:   b'j', u32 length, json
+"""
+from collections.abc import Mapping
+import json
+import mmap
+import struct
+from .utils import loads_json
+
+
+MAGIC = b'TYPECONF\x01'
+_header = struct.Struct('<Q')
+_count = struct.Struct('<I')
+_offset = struct.Struct('<Q')
+
+
+def dump_binary_cfg(cfg, path):
+    """
+    Writes a resolved config to path.
+    """
+    buf = bytearray(MAGIC + _header.pack(0))
+    root = _encode(cfg, buf)
+    _header.pack_into(buf, len(MAGIC), root)
+    with open(path, 'wb') as f:
+        f.write(buf)
+
+
+def _encode(value, buf):
+    """
+    Appends value to buf, returns its offset.
+    """
+    if isinstance(value, Mapping):
+        offsets = [(str(key), _encode(v, buf)) for key, v in value.items()]
+        offset = len(buf)
+        buf += b'd' + _count.pack(len(offsets))
+        for key, value_offset in offsets:
+            key = key.encode('utf-8')
+            buf += _count.pack(len(key)) + key + _offset.pack(value_offset)
+        return offset
+
+    data = json.dumps(value).encode('utf-8')
+    offset = len(buf)
+    buf += b'j' + _count.pack(len(data)) + data
+    return offset
+
+
+def load_binary_cfg(path):
+    """
+    Memory-maps a binary config and returns its root.
+    """
+    with open(path, 'rb') as f:
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if buf[:len(MAGIC)] != MAGIC:
+        raise ValueError("Not a binary config %s" % path)
+    root, = _header.unpack_from(buf, len(MAGIC))
+    return _decode(buf, root)
+
+
+def _decode(buf, offset):
+    if buf[offset:offset + 1] == b'd':
+        return BinaryCfg(buf, offset)
+    length, = _count.unpack_from(buf, offset + 1)
+    start = offset + 1 + _count.size
+    return loads_json(buf[start:start + length])
+
+
+class BinaryCfg(Mapping):
+    """
+    Read-only view on a dict in a binary config.
+
+    Values are decoded on access.
+    """
+    # written from a resolved config, nothing to interpolate
+    __typeconf_resolved__ = True
+
+    def __init__(self, buf, offset):
+        self._buf = buf
+        self._offset = offset
+        self._index = None
+
+    def _keys(self):
+        if self._index is None:
+            buf = self._buf
+            n, = _count.unpack_from(buf, self._offset + 1)
+            pos = self._offset + 1 + _count.size
+            index = {}
+            for _ in range(n):
+                length, = _count.unpack_from(buf, pos)
+                pos += _count.size
+                key = buf[pos:pos + length].decode('utf-8')
+                pos += length
+                index[key], = _offset.unpack_from(buf, pos)
+                pos += _offset.size
+            self._index = index
+        return self._index
+
+    def __getitem__(self, key):
+        return _decode(self._buf, self._keys()[key])
+
+    def __iter__(self):
+        return iter(self._keys())
+
+    def __len__(self):
+        return len(self._keys())
+
+    def get_path(self, path):
+        """
+        Value at a dotted path, e.g. optimizer.lr
+        """
+        value = self
+        for key in path.split('.'):
+            value = value[key]
+        return value
+
+    def to_dict(self):
+        return {key: value.to_dict() if isinstance(value, BinaryCfg) else value
+                for key, value in self.items()}
+
+    # the mapped file can't be pickled or copied, copies are plain dicts
+
+    def __reduce__(self):
+        return (dict, (self.to_dict(), ))
+
+    def __deepcopy__(self, memo):
+        return self.to_dict()
+
+    def __repr__(self):
+        return f'BinaryCfg({list(self._keys())})'
@@ -0,0 +1,144 @@
+import functools
+import threading
+import weakref
+from collections import OrderedDict, namedtuple
+
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+class LRUCache(object):
+    """
+    Bounded, thread-safe mapping evicting the least recently used entry.
+
+    maxsize None means unbounded.
+    """
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None, unwrap=None):
+        """
+        unwrap maps the stored value, e.g. dereferences a weak reference.
+        Entries it maps to None are dropped and counted as miss.
+        """
+        with self._lock:
+            if key in self._data:
+                value = self._data[key]
+                if unwrap is not None:
+                    value = unwrap(value)
+                if value is not None or unwrap is None:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            self._evict()
+
+    def get_or_create(self, key, factory):
+        """
+        Returns the cached value or stores the result of factory().
+
+        The lock is held while creating so concurrent callers
+        share a single value.
+        """
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            value = factory()
+            self._data[key] = value
+            self._evict()
+            return value
+
+    def pop(self, key, default=None):
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def resize(self, maxsize):
+        with self._lock:
+            self.maxsize = maxsize
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+    def _evict(self):
+        if self.maxsize is None:
+            return
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+
+def memoize_build(maxsize=128, weak=False):
+    """
+    Memoizes a build method per config fingerprint and arguments.
+
+    With weak, only weak references to the results are kept and a result
+    is built again once it has been garbage collected. Results not
+    supporting weak references are kept. Calls with unhashable arguments
+    are not cached. Like functools.lru_cache, cache_info and cache_clear
+    are attached to the method.
+    """
+    def decorator(fn):
+        cache = LRUCache(maxsize)
+
+        @functools.wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            try:
+                key = (self.fingerprint(), args, frozenset(kwargs.items()))
+                hash(key)
+            except TypeError:
+                return fn(self, *args, **kwargs)
+
+            # collected results count as miss
+            result = cache.get(key, unwrap=_call)
+            if result is not None:
+                return result
+
+            result = fn(self, *args, **kwargs)
+            try:
+                entry = weakref.ref(result) if weak else None
+            except TypeError:
+                entry = None
+            if entry is None:
+                entry = functools.partial(_identity, result)
+            cache.put(key, entry)
+            return result
+
+        wrapper.cache_info = cache.info
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    return decorator
+
+
+def _identity(value):
+    return value
+
+
+def _call(entry):
+    return entry()
@@ -16,9 +16,12 @@ Syntactic sugar with presets?
 Print help also in a nested fashion
 """
 import inspect
-from typeconf import BaseConfig, SelectConfig
+from typeconf import BaseConfig, SelectConfig, __version__
 import sys as _sys
 import functools
+import hashlib
+import json
+import os
 
 
 def isxtype(cls, x):
@@ -54,22 +57,64 @@ class Action(object):
 
 
 class DefaultAction(Action):
+    type = 'default'
+
     def __call__(self, value):
         # TODO maybe dict?
         return value[0]
 
 
 class ListAction(Action):
+    type = 'list'
+
     def __call__(self, value):
         return value
 
 
+# table entry of a subparser, set directly with a preset
+_SUBPARSER = object()
+
+_action_types = {
+    DefaultAction.type: DefaultAction,
+    ListAction.type: ListAction,
+}
+
+
+def schema_fingerprint(config):
+    """
+    Fingerprint for caching the parser of a config.
+
+    Covers the config class and the source files of all
+    loaded config classes, without introspecting fields.
+    """
+    files = set()
+    stack = [BaseConfig]
+    while stack:
+        cls = stack.pop()
+        stack.extend(cls.__subclasses__())
+        path = getattr(_sys.modules.get(cls.__module__), '__file__', None)
+        if path is not None:
+            files.add(path)
+
+    h = hashlib.sha1()
+    h.update(f'{__version__}:{config.__module__}:{config.__qualname__}'.encode())
+    for path in sorted(files):
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        h.update(f'{path}:{st.st_mtime_ns}:{st.st_size}'.encode())
+    return h.hexdigest()
+
+
 class Parser(object):
     def __init__(self,
                  prefix_chars='-'):
         self.prefix_chars = prefix_chars
         self._actions = {}
         self._subparsers = {}
+        # compiled by _compile
+        self._table = None
 
     def add_argument(self, dest, type='default', **kwargs):
         if not dest.startswith('--'):
@@ -79,47 +124,98 @@ class Parser(object):
         if action_name in self._actions:
             raise ValueError(f'destination {action_name} exists')
 
-        if type == 'default':
-            self._actions[action_name] = DefaultAction(action_name)
-        elif type == 'list':
-            self._actions[action_name] = ListAction(action_name)
-        else:
+        if type not in _action_types:
             raise ValueError(f'Unknown type {type}')
+        self._actions[action_name] = _action_types[type](action_name)
+        self._table = None
 
     def add_subparser(self, parser, name):
         self._subparsers[name] = parser
+        self._table = None
         return parser
 
     def parse_args(self, args=None):
         """
         args: List
+
+        Single pass over args, every destination is looked up
+        in the flat table of dotted paths.
         """
         if args is None:
             args = _sys.argv[1:]
         else:
             args = list(args)
 
-        args = Parser.arglist2dict(args)
-        return self._parse_args(args)
+        result = {}
+        if len(args) == 0:
+            return result
+
+        if not args[0].startswith('--'):
+            raise ValueError(f"Positional keywords are not supported: {args[0]}")
+
+        table, dynamic = self._compile()
+        i = 0
+        while i < len(args):
+            dest = args[i][2:]
+            i = i + 1
+            values = []
+            while i < len(args) and not args[i].startswith('-'):
+                values.append(args[i])
+                i = i + 1
+            if len(values) == 0:
+                raise ValueError("Flag is not allowed")
+            # skip until next destination
+            while i < len(args) and not args[i].startswith('--'):
+                i = i + 1
+            Parser.update_arg_dict(result, dest, Parser._dispatch(table, dynamic, dest, values))
+        return result
+
+    @staticmethod
+    def _dispatch(table, dynamic, dest, values):
+        entry = table.get(dest)
+        if entry is _SUBPARSER:
+            # if it's a list, it is because it's a preset
+            return values[0]
+        if entry is not None:
+            return entry(values)
+
+        # everything below a dynamic parser is accepted
+        head = dest
+        while '.' in head:
+            head = head.rsplit('.', 1)[0]
+            if head in dynamic:
+                break
+        else:
+            if '' not in dynamic:
+                raise ValueError(f"Unknown argument {dest}")
+        # current behviour for unknown. If list with 1 value return 1 value
+        if len(values) == 1:
+            return values[0]
+        return values
 
-    def _parse_args(self, args : dict):
+    def _compile(self):
         """
-        Converts arguments into dictionary.
+        Flat table from dotted path to action
+        and the set of paths of dynamic parsers.
         """
-        result = {}
-        for key, value in args.items():
-            if key in self._subparsers:
-                # if it's a list, it is because it's a preset
-                if isinstance(value, list):
-                    result[key] = value[0]
-                else:
-                    result[key] = self._subparsers[key]._parse_args(value)
-            elif key in self._actions:
-                result[key] = self._actions[key](value)
-            else:
-                raise ValueError(f"Unknown argument {key}")
+        if self._table is not None:
+            return self._table
 
-        return result
+        table = {}
+        dynamic = set()
+        if isinstance(self, DynamicParser):
+            dynamic.add('')
+        else:
+            table.update(self._actions)
+            for name, parser in self._subparsers.items():
+                table[name] = _SUBPARSER
+                subtable, subdynamic = parser._compile()
+                for path, entry in subtable.items():
+                    table[f'{name}.{path}'] = entry
+                for path in subdynamic:
+                    dynamic.add(f'{name}.{path}' if path else name)
+        self._table = (table, dynamic)
+        return self._table
 
     @staticmethod
     def arglist2dict(args):
@@ -210,13 +306,52 @@ class Parser(object):
         return parser
 
 
-class DynamicParser(Parser):
-    def _parse_args(self, args):
+    def to_spec(self):
         """
-        args: dict
+        Serialisable description of the parser.
         """
-        # current behviour for unknown. If list with 1 value return 1 value
-        for key, values in args.items():
-            if isinstance(values, list) and len(values) == 1:
-                args[key] = values[0]
-        return args
+        return {
+            'dynamic': isinstance(self, DynamicParser),
+            'actions': {name: action.type for name, action in self._actions.items()},
+            'subparsers': {name: parser.to_spec() for name, parser in self._subparsers.items()},
+        }
+
+    @staticmethod
+    def from_spec(spec):
+        parser = DynamicParser() if spec['dynamic'] else Parser()
+        for name, type in spec['actions'].items():
+            parser.add_argument(f"--{name}", type=type)
+        for name, subspec in spec['subparsers'].items():
+            parser.add_subparser(Parser.from_spec(subspec), name)
+        return parser
+
+    @staticmethod
+    def from_config_cached(config, cache_dir):
+        """
+        Like from_config, but stores the parser spec in cache_dir
+        keyed by the schema fingerprint.
+        """
+        path = os.path.join(cache_dir, f'parser-{schema_fingerprint(config)}.json')
+        try:
+            with open(path, 'r') as f:
+                return Parser.from_spec(json.load(f))
+        except (OSError, ValueError, KeyError):
+            pass
+
+        parser = Parser.from_config(config)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_path = f'{path}.{os.getpid()}.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(parser.to_spec(), f)
+            os.replace(tmp_path, path)
+        except OSError:
+            # the cache is optional, e.g. read-only dirs
+            pass
+        return parser
+
+
+class DynamicParser(Parser):
+    """
+    Accepts any argument, the selected option is not known while parsing.
+    """
@@ -1,23 +1,211 @@
 from omegaconf import OmegaConf
+from collections.abc import Mapping
+import copy
+import json
 import os
-from .utils import read_file_cfg
+from .utils import read_file_cfg, copy_raw
+from .cache import LRUCache
 
 
 class IRConfig(OmegaConf):
     preset_paths = []
+    # preset name -> file, the first registered dir wins
+    preset_index = {}
     systems_config = {}
+    # preset names per registered dir
+    _dir_indices = {}
+    _persisted_dirs = set()
+    _index_filename = '.typeconf_presets.json'
+    # parsed presets keyed by (path, mtime, size)
+    _preset_cache = LRUCache(maxsize=64)
+
+    @staticmethod
+    def has_interpolation(cfg):
+        """
+        Cheap scan whether any value in the container is an interpolation.
+
+        Containers marked with __typeconf_resolved__ are skipped.
+        """
+        stack = [cfg]
+        while stack:
+            value = stack.pop()
+            if isinstance(value, str):
+                if '${' in value:
+                    return True
+            elif isinstance(value, Mapping):
+                if not getattr(value, '__typeconf_resolved__', False):
+                    stack.extend(value.values())
+            elif isinstance(value, (list, tuple)):
+                stack.extend(value)
+        return False
+
+    @classmethod
+    def resolve_container(cls, cfg):
+        """
+        Resolves all interpolations and returns a plain dict.
+
+        Skips OmegaConf if there is nothing to resolve. Either way the
+        result shares no dicts or lists with cfg, callers may reuse it.
+        """
+        if not cls.has_interpolation(cfg):
+            return copy_raw(dict(cfg))
+        cfg = cls.create(cls._to_plain(cfg))
+        return cls.to_container(cfg, resolve=True)
+
+    @staticmethod
+    def _to_plain(value):
+        """
+        Copy with read-only mappings, e.g. binary configs, as dicts for OmegaConf.
+        """
+        if isinstance(value, Mapping):
+            return {key: IRConfig._to_plain(v) for key, v in value.items()}
+        if isinstance(value, list):
+            return [IRConfig._to_plain(v) for v in value]
+        return value
 
     @classmethod
-    def register_preset_dir(cls, path):
+    def register_preset_dir(cls, path, persist=False):
+        """
+        Registers a preset dir and indexes the presets in it.
+
+        With persist, the index is stored in the dir and reused by later
+        registrations instead of scanning, as long as no file or directory
+        was added or removed.
+        """
+        path = os.fspath(path)
         cls.preset_paths.append(path)
+        names = None
+        if persist:
+            cls._persisted_dirs.add(path)
+            names = cls._load_index(path)
+        if names is None:
+            names = cls._scan_preset_dir(path)
+            if persist:
+                cls._store_index(path, names)
+        cls._dir_indices[path] = names
+        for name in names:
+            cls.preset_index.setdefault(name, os.path.join(path, name))
+
+    @classmethod
+    def rescan_preset_dirs(cls):
+        """
+        Rebuilds the index of all registered preset dirs.
+        """
+        cls.preset_index = {}
+        for path in cls.preset_paths:
+            if path not in cls._dir_indices:
+                continue
+            names = cls._scan_preset_dir(path)
+            if path in cls._persisted_dirs:
+                cls._store_index(path, names)
+            cls._dir_indices[path] = names
+            for name in names:
+                cls.preset_index.setdefault(name, os.path.join(path, name))
+
+    @classmethod
+    def _scan_preset_dir(cls, path):
+        names = []
+        for root, _, files in cls._walk(path):
+            for filename in files:
+                if filename == cls._index_filename:
+                    continue
+                names.append(os.path.relpath(os.path.join(root, filename), path))
+        return names
+
+    @staticmethod
+    def _walk(path):
+        """
+        os.walk following links to directories, each visited once.
+        """
+        seen = set()
+        for root, subdirs, files in os.walk(path, followlinks=True):
+            seen.add(os.path.realpath(root))
+            # links back up would never end
+            subdirs[:] = [d for d in subdirs if os.path.realpath(os.path.join(root, d)) not in seen]
+            yield root, subdirs, files
+
+    @classmethod
+    def _load_index(cls, path):
+        """
+        Stored index of path, None if missing or outdated.
+
+        Outdated if the listing of path or the modification time
+        of any directory below it changed.
+        """
+        try:
+            with open(os.path.join(path, cls._index_filename), 'r') as f:
+                index = json.load(f)
+            if index['root'] != cls._listing(path):
+                return None
+            for subdir, mtime in index['dirs'].items():
+                if os.stat(os.path.join(path, subdir)).st_mtime_ns != mtime:
+                    return None
+            return index['names']
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    @classmethod
+    def _store_index(cls, path, names):
+        try:
+            dirs = {}
+            for root, subdirs, _ in cls._walk(path):
+                for subdir in subdirs:
+                    subdir = os.path.join(root, subdir)
+                    dirs[os.path.relpath(subdir, path)] = os.stat(subdir).st_mtime_ns
+            index = {'names': names, 'root': cls._listing(path), 'dirs': dirs}
+            with open(os.path.join(path, cls._index_filename), 'w') as f:
+                json.dump(index, f)
+        except OSError:
+            # read-only dirs are indexed on every registration
+            pass
+
+    @classmethod
+    def _listing(cls, path):
+        # writing the index changes the mtime of path, its listing is compared
+        return sorted(name for name in os.listdir(path) if name != cls._index_filename)
 
     @classmethod
     def load_preset(cls, path):
-        for p in cls.preset_paths:
-            filepath = os.path.join(p, path)
-            if os.path.isfile(filepath):
-                return read_file_cfg(filepath)
-        raise ValueError(f"{path} not found in preset paths")
+        if os.path.isabs(path):
+            # not below a preset dir, read as is
+            filepath = path if os.path.isfile(path) else None
+        else:
+            filepath = cls.preset_index.get(os.path.normpath(path))
+        if filepath is None:
+            raise ValueError(f"{path} not found in preset paths")
+        try:
+            return cls._read_preset(filepath)
+        except OSError as e:
+            # removed since indexing
+            raise ValueError(f"{path} not found in preset paths: {e}")
+
+    @classmethod
+    def _read_preset(cls, filepath):
+        """
+        Reads a preset through the cache.
+
+        Returns a copy, the cached preset is never handed out.
+        """
+        filepath = os.path.realpath(filepath)
+        st = os.stat(filepath)
+        key = (filepath, st.st_mtime_ns, st.st_size)
+        preset = cls._preset_cache.get_or_create(key, lambda: read_file_cfg(filepath))
+        return copy.deepcopy(preset)
+
+    @classmethod
+    def preset_cache_info(cls):
+        return cls._preset_cache.info()
+
+    @classmethod
+    def clear_preset_cache(cls):
+        cls._preset_cache.clear()
+
+    @classmethod
+    def set_preset_cache_size(cls, maxsize):
+        """
+        Bounds the number of cached presets, None for unbounded.
+        """
+        cls._preset_cache.resize(maxsize)
 
     @classmethod
     def register_system_var_from_file(cls, filepath):
@@ -1,8 +1,23 @@
 from typeconf import SelectConfig
+import importlib
 
 
 class OptimizerConfig(SelectConfig):
     pass
 
-from .adadelta import AdadeltaConfig
-from .adagrad import AdagradConfig
+
+# imported when selected
+OptimizerConfig.register_lazy("Adadelta", f"{__name__}.adadelta.AdadeltaConfig")
+OptimizerConfig.register_lazy("Adagrad", f"{__name__}.adagrad.AdagradConfig")
+
+_options = {
+    'AdadeltaConfig': 'adadelta',
+    'AdagradConfig': 'adagrad',
+}
+
+
+def __getattr__(name):
+    if name in _options:
+        module = importlib.import_module(f'.{_options[name]}', __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,129 @@
+"""
+Field usage over many runs
+
+Reads the dumps written by BaseConfig.dump_stats and counts per schema
+in how many runs each field of a class and selected option was present
+and accessed. Fields of the same class at several paths count once per run.
+"""
+from collections import deque
+from itertools import islice
+import os
+from .utils import iter_file_cfgs
+
+
+def find_dumps(paths):
+    """
+    Yields the dump files in paths, directories are searched recursively.
+    """
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for filename in sorted(files):
+                if filename.endswith('.json') or filename.endswith('.jsonl'):
+                    yield os.path.join(root, filename)
+
+
+def index_dumps(paths):
+    """
+    Usage per schema and (owner, option, field): [runs, runs used, accesses]
+    """
+    index = {}
+    for path in paths:
+        for dump in iter_file_cfgs(path):
+            _add_dump(index, dump)
+    return index
+
+
+def _add_dump(index, dump):
+    run = {}
+    for entry in dump['fields']:
+        key = (entry['owner'], entry['option'], entry['path'].rpartition('.')[2])
+        used, count = run.get(key, (False, 0))
+        run[key] = (used or entry['count'] > 0, count + entry['count'])
+    usage = index.setdefault(dump['schema'], {})
+    for key, (used, count) in run.items():
+        stats = usage.setdefault(key, [0, 0, 0])
+        stats[0] += 1
+        stats[1] += used
+        stats[2] += count
+
+
+def merge_index(index, other):
+    for schema, usage in other.items():
+        own = index.setdefault(schema, {})
+        for key, stats in usage.items():
+            if key in own:
+                own[key] = [a + b for a, b in zip(own[key], stats)]
+            else:
+                own[key] = list(stats)
+    return index
+
+
+def build_index(paths, workers=None, chunksize=64):
+    """
+    Index over all dumps found in paths.
+
+    With workers, chunks of files are indexed in a process pool,
+    at most 2 * workers chunks are in flight.
+    """
+    files = find_dumps(paths)
+    if not workers:
+        return index_dumps(files)
+
+    from concurrent.futures import ProcessPoolExecutor
+    index = {}
+    pending = deque()
+    with ProcessPoolExecutor(workers) as pool:
+        while True:
+            chunk = list(islice(files, chunksize))
+            if chunk:
+                pending.append(pool.submit(index_dumps, chunk))
+            if not pending:
+                break
+            if not chunk or len(pending) >= 2 * workers:
+                merge_index(index, pending.popleft().result())
+    return index
+
+
+def unused_fields(index, rare=0.05):
+    """
+    Per schema the never used and the rarely used fields,
+    used in less than rare of the runs they were present in.
+    """
+    report = {}
+    for schema, usage in index.items():
+        never = []
+        rarely = []
+        for (owner, option, field), (runs, used, count) in sorted(usage.items(), key=_sort_key):
+            entry = {'owner': owner, 'option': option, 'field': field,
+                     'runs': runs, 'used': used, 'count': count}
+            if used == 0:
+                never.append(entry)
+            elif used < rare * runs:
+                rarely.append(entry)
+        report[schema] = {'never': never, 'rarely': rarely}
+    return report
+
+
+def _sort_key(item):
+    (owner, option, field), _ = item
+    return (owner, option or '', field)
+
+
+def format_report(report, rare=0.05):
+    lines = []
+    for schema, fields in sorted(report.items()):
+        lines.append(schema)
+        for kind, title in (('never', 'never used'), ('rarely', f'used in less than {rare:.0%} of runs')):
+            if not fields[kind]:
+                continue
+            lines.append(f'  {title}:')
+            for entry in fields[kind]:
+                owner = entry['owner']
+                if entry['option'] is not None:
+                    owner = f"{owner}[{entry['option']}]"
+                lines.append(f"    {owner}.{entry['field']}  {entry['used']}/{entry['runs']} runs")
+    return '\n'.join(lines)
@@ -0,0 +1,281 @@
+"""
+Access statistics of config trees
+
+With a spool directory, configs sent to other processes keep recording
+into a per process AccessStats. Workers write the counts accessed since
+they were started to the spool at exit or on flush_stats, the process
+owning the tree merges and deletes the spool files when reading its stats.
+
+AccessLog appends the access of a tree to a JSON Lines file from a
+background thread, one record per interval:
+    {"time": 1.0, "first": {"optimizer.lr": 0.5}, "counts": {"optimizer.lr": 3}}
+with the time of first accesses and the counts since the previous record.
+"""
+from collections import deque
+from multiprocessing import util
+import atexit
+import json
+import os
+import threading
+import time
+import uuid
+
+
+# spool directory -> stats recorded for it in this process
+_spools = {}
+
+
+class AccessStats(object):
+    """
+    Access counts of a config tree keyed by dotted path.
+
+    Shared by all configs of a tree and updated on access,
+    snapshots don't walk the tree.
+    """
+    __slots__ = ('counts', 'unused', 'spool', 'owner', 'baseline', 'log')
+
+    def __init__(self, spool=None, owner=None):
+        self.counts = {}
+        # paths of fields never accessed
+        self.unused = set()
+        self.spool = spool
+        # pid of the process merging the spool
+        self.owner = owner
+        # counts already written to the spool
+        self.baseline = {}
+        # AccessLog notified on first access
+        self.log = None
+
+    def __reduce__(self):
+        if self.spool is None:
+            return (AccessStats, ())
+        return (spooled_stats, (self.spool, ))
+
+    def add_fields(self, prefix, names):
+        for name in names:
+            path = prefix + name
+            if path not in self.counts:
+                self.unused.add(path)
+
+    def merge(self, other, prefix=''):
+        """
+        Adds the counts of other with its paths below prefix.
+        """
+        self._add_counts(other.counts, prefix)
+        for path in other.unused:
+            path = prefix + path
+            if path not in self.counts:
+                self.unused.add(path)
+
+    def _add_counts(self, counts, prefix=''):
+        own = self.counts
+        for path, count in counts.items():
+            path = prefix + path
+            own[path] = own.get(path, 0) + count
+            self.unused.discard(path)
+
+    def collect(self):
+        """
+        Merges and deletes the spool files written by other processes.
+        """
+        if self.spool is None or self.owner != os.getpid():
+            return
+        for filename in sorted(os.listdir(self.spool)):
+            if not filename.endswith('.json'):
+                continue
+            path = os.path.join(self.spool, filename)
+            with open(path, 'r') as f:
+                counts = json.load(f)
+            # merged once
+            os.remove(path)
+            self._add_counts(counts)
+
+    def flush(self):
+        """
+        Writes the counts since the last flush to the spool.
+        """
+        if self.spool is None or self.owner == os.getpid():
+            return
+        delta = {}
+        for path, count in self.counts.items():
+            count -= self.baseline.get(path, 0)
+            if count > 0:
+                delta[path] = count
+        if not delta:
+            return
+        name = f'{os.getpid()}-{uuid.uuid4().hex}'
+        tmp_path = os.path.join(self.spool, name + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(delta, f)
+        # complete files only
+        os.replace(tmp_path, os.path.join(self.spool, name + '.json'))
+        self.baseline = dict(self.counts)
+
+    def snapshot(self, prefix=''):
+        """
+        Copy of the counts below prefix.
+        """
+        self.collect()
+        if not prefix:
+            return dict(self.counts)
+        n = len(prefix)
+        return {path[n:]: count for path, count in self.counts.items()
+                if path.startswith(prefix)}
+
+    def find_unused(self, prefix=''):
+        self.collect()
+        if not prefix:
+            return set(self.unused)
+        n = len(prefix)
+        return {path[n:] for path in self.unused if path.startswith(prefix)}
+
+
+class AccessLog(object):
+    """
+    Writes the access of a tree to path every interval seconds.
+
+    Accessing a field the first time only queues the path and time,
+    at most buffer_size are queued, further ones are counted as dropped.
+    Counts are taken from the stats by the writing thread. The log is
+    appended to and flushed per record, on a crash at most one interval
+    is lost. Closed at exit.
+    """
+    def __init__(self, stats, path, interval=10.0, buffer_size=10000):
+        self.stats = stats
+        self.path = path
+        self.interval = interval
+        self.buffer_size = buffer_size
+        self.dropped = 0
+        self._first = deque()
+        self._written = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._file = open(path, 'a')
+        self._thread = threading.Thread(target=self._run, name='typeconf-access-log', daemon=True)
+        self._thread.start()
+        stats.log = self
+        atexit.register(self.close)
+
+    def first_access(self, path):
+        if len(self._first) >= self.buffer_size:
+            self.dropped += 1
+            return
+        self._first.append((path, time.time()))
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.write()
+
+    def write(self):
+        """
+        Appends the access since the last record.
+        """
+        with self._lock:
+            first = {}
+            while self._first:
+                path, t = self._first.popleft()
+                first[path] = t
+            counts = dict(self.stats.counts)
+            delta = {}
+            for path, count in counts.items():
+                count -= self._written.get(path, 0)
+                if count > 0:
+                    delta[path] = count
+            if not first and not delta and not self.dropped:
+                return
+            record = {'time': time.time(), 'first': first, 'counts': delta}
+            if self.dropped:
+                record['dropped'] = self.dropped
+                self.dropped = 0
+            self._file.write(json.dumps(record, separators=(',', ':')) + '\n')
+            self._file.flush()
+            self._written = counts
+
+    def close(self):
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        self._thread.join()
+        self.write()
+        self._file.close()
+        if self.stats.log is self:
+            self.stats.log = None
+        atexit.unregister(self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def read_access_log(path):
+    """
+    Per path the time of the first and last access and the total count.
+
+    The last access is the time of the last record counting the path.
+    """
+    from .utils import loads_json
+    result = {}
+    with open(path, 'rb') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = loads_json(line)
+            for path, t in record['first'].items():
+                entry = result.setdefault(path, {'first': None, 'last': t, 'count': 0})
+                if entry['first'] is None or t < entry['first']:
+                    entry['first'] = t
+            for path, count in record['counts'].items():
+                entry = result.setdefault(path, {'first': None, 'last': None, 'count': 0})
+                entry['count'] += count
+                entry['last'] = record['time']
+    return result
+
+
+def spool_stats(stats, spool):
+    """
+    Makes the current process own stats, collecting from spool.
+    """
+    os.makedirs(spool, exist_ok=True)
+    stats.spool = spool
+    stats.owner = os.getpid()
+    _spools[spool] = stats
+
+
+def spooled_stats(spool):
+    """
+    Stats of this process for a spool, configs unpickled
+    from the same tree share them.
+    """
+    stats = _spools.get(spool)
+    if stats is None:
+        stats = _spools[spool] = AccessStats(spool)
+    return stats
+
+
+def flush_stats():
+    """
+    Writes the access counts of this process to the spools.
+
+    Called at exit of multiprocessing workers, call it explicitly
+    in processes ending otherwise.
+    """
+    for stats in list(_spools.values()):
+        stats.flush()
+
+
+def _after_fork_in_child():
+    # counts until the fork belong to the parent
+    for stats in _spools.values():
+        stats.baseline = dict(stats.counts)
+
+
+def _register_flush(fn):
+    util.Finalize(None, fn, exitpriority=10)
+
+
+os.register_at_fork(after_in_child=_after_fork_in_child)
+# the finalizers of the parent are cleared in forked workers
+util.register_after_fork(flush_stats, _register_flush)
+_register_flush(flush_stats)
@@ -1,16 +1,173 @@
+from .cache import LRUCache
+import importlib.util
+import logging
+import marshal
+import os
+import struct
+import sys
+
+
+logger = logging.getLogger(__name__)
+
+# Store compiled python configs in __pycache__ next to the source
+write_bytecode = False
+
+# json decoder, None picks orjson if installed
+_json_backend = None
+
+# compiled python configs keyed by (path, mtime, size)
+_code_cache = LRUCache(maxsize=32)
+_bytecode_header = struct.Struct('<qq')
+
+
+def yaml_loader():
+    """
+    Safe loader using libyaml if available.
+    """
+    import yaml
+    return getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+def yaml_backend():
+    """
+    Which yaml implementation is used: libyaml or python
+    """
+    import yaml
+    if yaml_loader() is yaml.SafeLoader:
+        return 'python'
+    return 'libyaml'
+
+
+def set_json_backend(name):
+    """
+    Selects the json decoder: json, orjson or None for the fastest available.
+    """
+    global _json_backend
+    if name not in (None, 'json', 'orjson'):
+        raise ValueError("Unknown json backend %s" % name)
+    _json_backend = name
+
+
+def json_backend():
+    if _json_backend is not None:
+        return _json_backend
+    try:
+        import orjson  # noqa: F401
+    except ImportError:
+        return 'json'
+    return 'orjson'
+
+
+def loads_json(data):
+    """
+    Decodes json from bytes or str.
+
+    orjson is stricter than json, e.g. on NaN or big integers.
+    Whatever it rejects is decoded with json, so results and
+    errors are the same for both backends.
+    """
+    import json
+    if json_backend() == 'orjson':
+        import orjson
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+def compile_py_cfg(path):
+    """
+    Code object of a python config.
+
+    Cached in memory and in a marshal file in __pycache__,
+    both keyed by modification time and size of the source.
+    The marshal file is only written if write_bytecode is set.
+    """
+    path = os.path.realpath(path)
+    st = os.stat(path)
+    key = (path, st.st_mtime_ns, st.st_size)
+    return _code_cache.get_or_create(key, lambda: _load_bytecode(path, st))
+
+
+def _load_bytecode(path, st):
+    cache_path = importlib.util.cache_from_source(path, optimization='typeconf')
+    header = importlib.util.MAGIC_NUMBER + _bytecode_header.pack(st.st_mtime_ns, st.st_size)
+    try:
+        with open(cache_path, 'rb') as f:
+            data = f.read()
+        if data.startswith(header):
+            return marshal.loads(data[len(header):])
+    except (OSError, ValueError, EOFError, TypeError):
+        pass
+
+    with open(path, 'r') as f:
+        code = compile(f.read(), path, 'exec')
+
+    if write_bytecode and not sys.dont_write_bytecode:
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            tmp_path = f'{cache_path}.{os.getpid()}.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(header + marshal.dumps(code))
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            logger.debug("Could not write bytecode for %s", path)
+    return code
+
+
+def copy_raw(value):
+    """
+    Copies the dicts and lists of a raw config,
+    read-only mappings like binary configs are kept.
+    """
+    if isinstance(value, dict):
+        return {key: copy_raw(v) for key, v in value.items()}
+    if isinstance(value, list):
+        return [copy_raw(v) for v in value]
+    return value
+
+
 def read_file_cfg(path):
     if path.endswith('.json'):
-        import json
+        with open(path, 'rb') as f:
+            return loads_json(f.read())
+    if path.endswith('.yaml') or path.endswith('.yml'):
+        import yaml
+        logger.debug("Loading %s with %s yaml loader", path, yaml_backend())
         with open(path, 'r') as f:
-            return json.load(f)
-    if path.endswith('.yaml'):
-        # TODO requires extra dependency
-        raise NotImplementedError
+            return yaml.load(f, Loader=yaml_loader())
     if path.endswith('.py'):
-        content = open(path).read()
+        code = compile_py_cfg(path)
         # https://stackoverflow.com/questions/1463306/how-does-exec-work-with-locals
         ldict = {}
-        exec(content, globals(), ldict)
+        exec(code, globals(), ldict)
         return ldict['cfg']
+    if path.endswith('.tcfg'):
+        from .binary import load_binary_cfg
+        return load_binary_cfg(path)
 
     raise ValueError("Unknown file format %s" % path)
+
+
+def iter_file_cfgs(path):
+    """
+    Yields one config at a time from a file holding many.
+
+    Supports JSON Lines and multi-document yaml, other
+    formats yield their single config.
+    """
+    if path.endswith('.jsonl'):
+        with open(path, 'rb') as f:
+            for line in f:
+                if line.strip():
+                    yield loads_json(line)
+        return
+    if path.endswith('.yaml') or path.endswith('.yml'):
+        import yaml
+        with open(path, 'r') as f:
+            for cfg in yaml.load_all(f, Loader=yaml_loader()):
+                if cfg is not None:
+                    yield cfg
+        return
+    yield read_file_cfg(path)
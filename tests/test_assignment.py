@@ -0,0 +1,123 @@
+from typeconf import BaseConfig
+from pydantic import ValidationError, validator, root_validator
+import gc
+import pytest
+
+
+class RangeConfig(BaseConfig):
+    low : int = 0
+    high : int = 10
+    other : int = 0
+
+    class Config:
+        incremental_assignment = True
+
+    @validator('high')
+    def above_low(cls, v, values):
+        if 'low' in values and v < values['low']:
+            raise ValueError("high below low")
+        return v
+
+    @validator('other')
+    def count(cls, v):
+        RangeConfig.validated += 1
+        return v
+
+    @root_validator(skip_on_failure=True)
+    def not_equal(cls, values):
+        if values['low'] == values['high']:
+            raise ValueError("empty range")
+        return values
+
+RangeConfig.validated = 0
+
+
+class ChildConfig(BaseConfig):
+    test : int = 1
+
+
+class FrozenConfig(BaseConfig):
+    child : ChildConfig
+
+    class Config:
+        allow_mutation = False
+
+
+class LazyConfig(BaseConfig):
+    child : ChildConfig
+
+    class Config:
+        lazy = True
+
+
+def test_incremental():
+    cfg = RangeConfig()
+    RangeConfig.validated = 0
+    cfg.low = 5
+    assert cfg.low == 5
+    # not depending on low
+    assert RangeConfig.validated == 0
+    cfg.other = 1
+    assert RangeConfig.validated == 1
+
+
+def test_incremental_dependent():
+    cfg = RangeConfig()
+    with pytest.raises(ValidationError, match="high below low"):
+        cfg.low = 20
+    # nothing changed
+    assert cfg.low == 0
+    with pytest.raises(ValidationError, match="empty range"):
+        cfg.low = 10
+    with pytest.raises(ValidationError):
+        cfg.low = "x"
+    assert "low" not in cfg.__fields_set__
+
+
+def test_incremental_immutable():
+    class ImmutableConfig(RangeConfig):
+        class Config:
+            allow_mutation = False
+
+    cfg = ImmutableConfig()
+    with pytest.raises(TypeError):
+        cfg.low = 1
+
+
+def test_invalidate_fingerprint():
+    cfg = FrozenConfig(child={"test": 1})
+    fingerprint = cfg.fingerprint()
+    assert cfg._fingerprint == fingerprint
+    cfg.child.test = 2
+    assert cfg._fingerprint is None
+    assert cfg.fingerprint() != fingerprint
+    assert cfg.fingerprint() == FrozenConfig(child={"test": 2}).fingerprint()
+
+
+def test_invalidate_evolved():
+    cfg = FrozenConfig(child={"test": 1})
+    variant = cfg.evolve()
+    # mutable, not shared
+    assert variant.child is not cfg.child
+    fingerprint = cfg.fingerprint()
+    assert variant.fingerprint() == fingerprint
+    cfg.child.test = 2
+    assert cfg.fingerprint() != fingerprint
+    assert variant.child.test == 1
+    assert variant.fingerprint() == fingerprint
+
+
+def test_parents_weak():
+    cfg = FrozenConfig(child={"test": 1})
+    child = cfg.child
+    del cfg
+    gc.collect()
+    assert child._parents == {}
+    child.test = 2
+
+
+def test_assign_pending():
+    cfg = LazyConfig(child={"test": 1})
+    cfg.child = ChildConfig(test=2)
+    assert cfg.child.test == 2
+    assert [ref() for ref in cfg.child._parents.values()] == [cfg]
@@ -0,0 +1,109 @@
+from typeconf import BaseConfig, SelectConfig, read_file_cfg
+from typeconf.binary import BinaryCfg, dump_binary_cfg
+from typing import List
+import copy
+import pickle
+import unittest.mock
+
+
+class BinarySelectConfig(SelectConfig):
+    pass
+
+
+@BinarySelectConfig.register('option1')
+class BinaryOption1Config(BinarySelectConfig):
+    test : float = 1.0
+
+
+class NestedConfig(BaseConfig):
+    test : int = 1
+    values : List[int] = []
+
+
+class BinaryConfig(BaseConfig):
+    test : str = "a"
+    nested : NestedConfig
+    select : BinarySelectConfig
+
+
+def test_roundtrip(tmp_path):
+    cfg = {"a": 1, "nested": {"b": [1, 2], "c": {"d": "ä"}}, "e": None}
+    path = str(tmp_path / 'config.tcfg')
+    dump_binary_cfg(cfg, path)
+    loaded = read_file_cfg(path)
+    assert isinstance(loaded, BinaryCfg)
+    assert loaded.to_dict() == cfg
+    assert loaded.get_path('nested.c.d') == "ä"
+
+
+def test_lazy_decode(tmp_path):
+    from typeconf import binary
+    cfg = {"a": list(range(100)), "nested": {"b": 1}}
+    path = str(tmp_path / 'config.tcfg')
+    dump_binary_cfg(cfg, path)
+    loaded = read_file_cfg(path)
+    with unittest.mock.patch.object(binary, 'loads_json', wraps=binary.loads_json) as loads:
+        assert loaded.get_path('nested.b') == 1
+    assert loads.call_count == 1
+
+
+def test_dump_binary(tmp_path):
+    cfg = BinaryConfig(**{"nested": {"test": 2, "values": [1, 2]}, "select": {"name": "option1", "test": 0.5}})
+    path = str(tmp_path / 'config.tcfg')
+    cfg.dump_binary(path)
+    loaded = BinaryConfig(**read_file_cfg(path))
+    assert loaded == cfg
+    assert isinstance(loaded.select, BinaryOption1Config)
+
+
+def test_cli_binary(tmp_path):
+    cfg = BinaryConfig(**{"nested": {"test": 2, "values": [1]}, "select": {"name": "option1"}})
+    path = str(tmp_path / 'config.tcfg')
+    cfg.dump_binary(path)
+    with unittest.mock.patch('sys.argv', ['_', '--config_path', path, '--nested.test', '3']):
+        kwargs = BinaryConfig.parse_cli_args()
+    loaded = BinaryConfig(**kwargs)
+    assert loaded.nested.test == 3
+    assert loaded.nested.values == [1]
+
+
+def test_cli_binary_interpolation(tmp_path):
+    from typeconf.irconfig import IRConfig
+    IRConfig.register_system_var("binary_test", "b")
+    cfg = BinaryConfig(**{"nested": {"test": 2, "values": [1]}, "select": {"name": "option1"}})
+    path = str(tmp_path / 'config.tcfg')
+    cfg.dump_binary(path)
+    with unittest.mock.patch('sys.argv', ['_', '--config_path', path, '--test', '${system:binary_test}']):
+        kwargs = BinaryConfig.parse_cli_args()
+    loaded = BinaryConfig(**kwargs)
+    assert loaded.test == "b"
+    assert loaded.nested.values == [1]
+    assert isinstance(loaded.select, BinaryOption1Config)
+
+
+class LazyBinaryConfig(BaseConfig):
+    test : str = "a"
+    nested : NestedConfig
+
+    class Config:
+        lazy = True
+
+
+def test_lazy_binary_copy(tmp_path):
+    path = str(tmp_path / 'config.tcfg')
+    dump_binary_cfg({"nested": {"test": 2, "values": [1]}}, path)
+    cfg = LazyBinaryConfig(**read_file_cfg(path))
+    assert isinstance(cfg._pending['nested'], BinaryCfg)
+    for other in (pickle.loads(pickle.dumps(cfg)), copy.deepcopy(cfg)):
+        assert other.nested.values == [1]
+    assert cfg.nested.test == 2
+
+
+def test_binary_preset(tmp_path):
+    from typeconf.irconfig import IRConfig
+    dump_binary_cfg({"test": 3, "values": [1, 2]}, str(tmp_path / 'nested.tcfg'))
+    IRConfig.register_preset_dir(str(tmp_path))
+    preset = IRConfig.load_preset('nested.tcfg')
+    assert preset == {"test": 3, "values": [1, 2]}
+    cfg = BinaryConfig(**{"nested": "${preset:nested.tcfg}", "select": {"name": "option1"}})
+    assert cfg.nested.values == [1, 2]
@@ -0,0 +1,91 @@
+from typeconf import BaseConfig, SelectConfig
+from typeconf.cache import LRUCache
+import threading
+
+
+class CacheSelectConfig(SelectConfig):
+    pass
+
+
+@CacheSelectConfig.register('option1')
+class CacheOption1Config(CacheSelectConfig):
+    test : int = 1
+
+
+@CacheSelectConfig.register('option2')
+class CacheOption2Config(CacheSelectConfig):
+    test : int = 2
+
+
+class Config(BaseConfig):
+    select : CacheSelectConfig
+
+
+def test_same_model():
+    BaseConfig.clear_model_cache()
+    cfg1 = Config(**{"select": {"name": "option1"}})
+    cfg2 = Config(**{"select": {"name": "option1", "test": 3}})
+    assert type(cfg1) is type(cfg2)
+    info = BaseConfig.model_cache_info()
+    assert info.misses == 1
+    assert info.hits > 0
+    assert info.currsize == 1
+
+
+def test_different_selection():
+    BaseConfig.clear_model_cache()
+    cfg1 = Config(**{"select": {"name": "option1"}})
+    cfg2 = Config(**{"select": {"name": "option2"}})
+    assert type(cfg1) is not type(cfg2)
+    assert isinstance(cfg2.select, CacheOption2Config)
+    assert BaseConfig.model_cache_info().currsize == 2
+
+
+def test_clear():
+    Config(**{"select": {"name": "option1"}})
+    BaseConfig.clear_model_cache()
+    info = BaseConfig.model_cache_info()
+    assert info.currsize == 0
+    assert info.hits == 0
+
+
+def test_lru_bounded():
+    cache = LRUCache(maxsize=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+    assert 'b' not in cache
+    assert 'a' in cache
+    assert cache.info().currsize == 2
+
+
+def test_lru_threadsafe():
+    cache = LRUCache(maxsize=None)
+    created = []
+
+    def factory():
+        created.append(1)
+        return object()
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_create('key', factory)))
+               for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(created) == 1
+    assert all(r is results[0] for r in results)
+
+
+def test_lru_unwrap():
+    from typeconf.cache import LRUCache
+    cache = LRUCache(maxsize=2)
+    cache.put('a', [1])
+    cache.put('b', [])
+    assert cache.get('a', unwrap=lambda v: v or None) == [1]
+    assert cache.get('b', 'default', unwrap=lambda v: v or None) == 'default'
+    assert 'b' not in cache
+    info = cache.info()
+    assert (info.hits, info.misses) == (1, 1)
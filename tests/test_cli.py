@@ -354,3 +354,15 @@ def test_wrong_path():
         cfg = Config(**kwargs)
 
 
+
+
+def test_parser_cache_dir(tmp_path, monkeypatch):
+    class Config(BaseConfig):
+        test : int
+
+    monkeypatch.setenv('TYPECONF_CACHE_DIR', str(tmp_path))
+    with unittest.mock.patch('sys.argv', ["_", "--test", "2"]):
+        kwargs = Config.parse_cli_args()
+        cfg = Config(**kwargs)
+    assert cfg.test == 2
+    assert len(list(tmp_path.iterdir())) == 1
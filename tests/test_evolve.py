@@ -0,0 +1,122 @@
+from typeconf import BaseConfig, SelectConfig
+from pydantic import ValidationError, validator, root_validator
+import pytest
+
+
+class EvolveSelectConfig(SelectConfig):
+    pass
+
+
+@EvolveSelectConfig.register('option1')
+class EvolveOption1Config(EvolveSelectConfig):
+    lr : float = 1.0
+
+
+@EvolveSelectConfig.register('option2')
+class EvolveOption2Config(EvolveSelectConfig):
+    rho : float = 1.0
+
+
+class NestedConfig(BaseConfig):
+    test : int = 1
+
+
+class FrozenNestedConfig(BaseConfig):
+    test : int = 1
+
+    class Config:
+        allow_mutation = False
+
+
+class EvolveConfig(BaseConfig):
+    test : int = 1
+    nested : NestedConfig
+    other : NestedConfig
+    optimizer : EvolveSelectConfig
+    frozen : FrozenNestedConfig = FrozenNestedConfig()
+
+
+class LazyEvolveConfig(BaseConfig):
+    nested : NestedConfig
+    other : NestedConfig
+
+    class Config:
+        lazy = True
+
+
+@pytest.fixture
+def cfg():
+    return EvolveConfig(**{"nested": {}, "other": {}, "optimizer": {"name": "option1"}})
+
+
+def test_evolve(cfg):
+    evolved = cfg.evolve(**{"optimizer.lr": 0.1, "test": "2"})
+    assert evolved.optimizer.lr == 0.1
+    assert evolved.test == 2
+    assert cfg.optimizer.lr == 1.0
+    assert cfg.test == 1
+    assert evolved.__dict__['frozen'] is not cfg.__dict__['frozen']
+    assert evolved.__dict__['nested'] is not cfg.__dict__['nested']
+    assert evolved.__dict__['optimizer'] is not cfg.__dict__['optimizer']
+    assert type(evolved) is type(cfg)
+
+
+def test_evolve_invalid(cfg):
+    with pytest.raises(ValidationError):
+        cfg.evolve(**{"nested.test": "x"})
+    with pytest.raises(ValueError):
+        cfg.evolve(**{"unknown": 1})
+    with pytest.raises(ValueError):
+        cfg.evolve(**{"test.test": 1})
+
+
+def test_evolve_option(cfg):
+    evolved = cfg.evolve(**{"optimizer.name": "option2", "optimizer.rho": 0.5})
+    assert isinstance(evolved.optimizer, EvolveOption2Config)
+    assert evolved.optimizer.rho == 0.5
+    assert EvolveConfig.build_config({"optimizer": {"name": "option2"}}) is type(evolved)
+
+    evolved = cfg.evolve(optimizer={"name": "option2"})
+    assert isinstance(evolved.optimizer, EvolveOption2Config)
+
+
+def test_evolve_lazy():
+    cfg = LazyEvolveConfig(**{"nested": {}, "other": {"test": 3}})
+    evolved = cfg.evolve(**{"nested.test": 2})
+    assert evolved.__dict__['other'] == {"test": 3}
+    assert evolved.nested.test == 2
+    assert evolved.other.test == 3
+
+
+def test_evolve_isolated(cfg):
+    evolved = cfg.evolve(test=5)
+    evolved.nested.test = 42
+    assert cfg.nested.test == 1
+    cfg.other.test = 43
+    assert evolved.other.test == 1
+
+
+class DependentConfig(BaseConfig):
+    a : int = 1
+    b : int = 2
+
+    @validator('b')
+    def above_a(cls, b, values):
+        assert b > values['a']
+        return b
+
+    @root_validator
+    def below_ten(cls, values):
+        assert values['a'] + values['b'] < 10
+        return values
+
+
+def test_evolve_validators():
+    cfg = DependentConfig()
+    with pytest.raises(ValidationError):
+        cfg.evolve(a=5)
+    with pytest.raises(ValidationError):
+        cfg.evolve(b=9)
+    # b is validated against the new a
+    evolved = cfg.evolve(b=3, a=2)
+    assert (evolved.a, evolved.b) == (2, 3)
@@ -0,0 +1,94 @@
+from typeconf import BaseConfig, SelectConfig
+from typing import Any, Callable, Dict, List
+
+
+class FingerprintSelectConfig(SelectConfig):
+    pass
+
+
+@FingerprintSelectConfig.register('option1')
+class FingerprintOption1Config(FingerprintSelectConfig):
+    test : int = 1
+
+
+@FingerprintSelectConfig.register('option2')
+class FingerprintOption2Config(FingerprintSelectConfig):
+    test : int = 1
+
+
+class NestedConfig(BaseConfig):
+    test : int = 1
+    table : Dict[str, int] = {}
+
+
+class FingerprintConfig(BaseConfig):
+    nested : NestedConfig
+    select : FingerprintSelectConfig
+    configs : List[NestedConfig] = []
+
+
+class OtherConfig(BaseConfig):
+    nested : NestedConfig
+    select : FingerprintSelectConfig
+    configs : List[NestedConfig] = []
+
+
+class FrozenConfig(BaseConfig):
+    test : int = 1
+
+    class Config:
+        allow_mutation = False
+
+
+def test_stable():
+    cfg1 = FingerprintConfig(**{
+        "nested": {"test": 2, "table": {"a": 1, "b": 2}},
+        "select": {"name": "option1"},
+    })
+    cfg2 = FingerprintConfig(**{
+        "select": {"name": "Option1"},
+        "nested": {"table": {"b": 2, "a": 1}, "test": 2},
+    })
+    assert cfg1.fingerprint() == cfg2.fingerprint()
+
+
+def test_different():
+    base = {"nested": {"test": 2}, "select": {"name": "option1"}}
+    fingerprint = FingerprintConfig(**base).fingerprint()
+    assert FingerprintConfig(**{**base, "nested": {"test": 3}}).fingerprint() != fingerprint
+    assert FingerprintConfig(**{**base, "select": {"name": "option2"}}).fingerprint() != fingerprint
+    assert FingerprintConfig(**{**base, "configs": [{"test": 2}]}).fingerprint() != fingerprint
+    assert OtherConfig(**base).fingerprint() != fingerprint
+
+
+def test_cached_on_frozen():
+    cfg = FrozenConfig()
+    assert cfg.fingerprint() == cfg._fingerprint
+
+    cfg = NestedConfig()
+    fingerprint = cfg.fingerprint()
+    assert cfg._fingerprint is None
+    cfg.test = 2
+    assert cfg.fingerprint() != fingerprint
+
+
+def test_untracked():
+    cfg = FingerprintConfig(**{"nested": {}, "select": {"name": "option1"}})
+    cfg.fingerprint()
+    assert cfg.get_stats() == {}
+
+
+class CallableConfig(BaseConfig):
+    fn : Callable = len
+    other : Any = None
+
+
+def test_callable():
+    import math
+    import pytest
+    fingerprint = CallableConfig().fingerprint()
+    assert CallableConfig(fn=len).fingerprint() == fingerprint
+    assert CallableConfig(fn=math.sqrt).fingerprint() != fingerprint
+    assert CallableConfig(fn=NestedConfig).fingerprint() != fingerprint
+    with pytest.raises(TypeError, match='"other"'):
+        CallableConfig(other=object()).fingerprint()
@@ -3,6 +3,7 @@ import os
 from typeconf.irconfig import IRConfig
 from typeconf import BaseConfig
 import pytest
+from typing import Dict
 
 
 def test_preset(tmp_path):
@@ -75,3 +76,186 @@ def test_system_resolve():
     cfg = {"test": "${system:test}"}
     cfg = NestedConfig(**cfg)
     assert cfg.test == 123
+
+
+class DeepConfig(BaseConfig):
+    nested : Config
+
+
+class DeeperConfig(BaseConfig):
+    nested : DeepConfig
+    test : int = 0
+
+
+def test_resolve_once():
+    import unittest.mock
+    IRConfig.register_system_var("deep", 3)
+    cfg = {"nested": {"nested": {"nested": {"test": "${system:deep}"}}}, "test": "${system:deep}"}
+    with unittest.mock.patch.object(IRConfig, 'create', wraps=IRConfig.create) as create:
+        cfg = DeeperConfig(**cfg)
+    assert create.call_count == 1
+    assert cfg.test == 3
+    assert cfg.nested.nested.nested.test == 3
+
+
+def test_has_interpolation():
+    assert not IRConfig.has_interpolation({"a": 1, "b": ["c", {"d": "e"}]})
+    assert IRConfig.has_interpolation({"a": 1, "b": ["c", {"d": "${system:test}"}]})
+    assert IRConfig.has_interpolation({"a": ("${system:test}", )})
+
+
+def test_resolve_container_fast_path():
+    import unittest.mock
+    cfg = {"a": 1, "nested": {"b": [1, 2]}}
+    with unittest.mock.patch.object(IRConfig, 'create', wraps=IRConfig.create) as create:
+        resolved = IRConfig.resolve_container(cfg)
+    assert create.call_count == 0
+    assert resolved == cfg
+
+
+class TableConfig(BaseConfig):
+    table : Dict[str, int]
+
+
+def test_resolve_container_reused_dict():
+    base = {'table': {'a': 0}}
+    cfgs = []
+    for i in range(3):
+        base['table']['a'] = i
+        cfgs.append(TableConfig(**base))
+    assert [(i, cfg.table['a']) for i, cfg in enumerate(cfgs)] == [(0, 0), (1, 1), (2, 2)]
+
+
+def test_resolve_benchmark():
+    import timeit
+    import unittest.mock
+    cfg = {"table": {"key%d" % i: i for i in range(10000)}}
+
+    def construct():
+        TableConfig(**cfg)
+
+    fast = min(timeit.repeat(construct, number=1, repeat=3))
+    with unittest.mock.patch.object(IRConfig, 'has_interpolation', return_value=True):
+        slow = min(timeit.repeat(construct, number=1, repeat=3))
+    assert fast < slow
+
+
+def test_preset_cache(tmp_path):
+    IRConfig.clear_preset_cache()
+    path = os.path.join(tmp_path, 'cached.json')
+    with open(path, 'w') as f:
+        json.dump({"test": 1}, f)
+
+    IRConfig.register_preset_dir(tmp_path)
+    preset = IRConfig.load_preset('cached.json')
+    preset['test'] = 2
+    assert IRConfig.load_preset('cached.json') == {"test": 1}
+    info = IRConfig.preset_cache_info()
+    assert info.misses == 1
+    assert info.hits == 1
+
+    # modified file is read again
+    with open(path, 'w') as f:
+        json.dump({"test": 10}, f)
+    os.utime(path, ns=(0, 0))
+    assert IRConfig.load_preset('cached.json') == {"test": 10}
+    assert IRConfig.preset_cache_info().misses == 2
+
+    IRConfig.set_preset_cache_size(1)
+    assert IRConfig.preset_cache_info().currsize == 1
+    IRConfig.set_preset_cache_size(64)
+
+
+def test_preset_index(tmp_path):
+    import unittest.mock
+    first = tmp_path / 'first'
+    second = tmp_path / 'second'
+    os.makedirs(first / 'sub')
+    os.makedirs(second)
+    with open(first / 'sub' / 'indexed.json', 'w') as f:
+        json.dump({"test": 1}, f)
+    with open(second / 'indexed2.json', 'w') as f:
+        json.dump({"test": 2}, f)
+    with open(first / 'indexed2.json', 'w') as f:
+        json.dump({"test": 3}, f)
+
+    IRConfig.register_preset_dir(first)
+    IRConfig.register_preset_dir(second)
+    assert IRConfig.load_preset('sub/indexed.json') == {"test": 1}
+    assert IRConfig.load_preset('indexed2.json') == {"test": 3}
+
+    with unittest.mock.patch('os.stat') as stat:
+        with pytest.raises(ValueError):
+            IRConfig.load_preset('missing_index.json')
+    assert stat.call_count == 0
+
+    with open(second / 'added.json', 'w') as f:
+        json.dump({"test": 4}, f)
+    with pytest.raises(ValueError):
+        IRConfig.load_preset('added.json')
+    IRConfig.rescan_preset_dirs()
+    assert IRConfig.load_preset('added.json') == {"test": 4}
+
+
+def test_preset_links(tmp_path):
+    real = tmp_path / 'real'
+    presets = tmp_path / 'pd' / 'presets'
+    os.makedirs(real)
+    os.makedirs(presets)
+    with open(real / 'x.json', 'w') as f:
+        json.dump({"test": 5}, f)
+    os.symlink(os.path.join('..', '..', 'real'), presets / 'linked')
+    # a link back up is visited once
+    os.symlink('..', presets / 'loop')
+
+    IRConfig.register_preset_dir(presets)
+    assert IRConfig.load_preset('linked/x.json') == {"test": 5}
+    assert IRConfig.load_preset(str(real / 'x.json')) == {"test": 5}
+    with pytest.raises(ValueError):
+        IRConfig.load_preset(str(real / 'missing.json'))
+
+
+def test_persisted_preset_index(tmp_path):
+    import unittest.mock
+    with open(tmp_path / 'persisted.json', 'w') as f:
+        json.dump({"test": 1}, f)
+
+    IRConfig.register_preset_dir(tmp_path, persist=True)
+    assert os.path.isfile(tmp_path / IRConfig._index_filename)
+    with unittest.mock.patch.object(IRConfig, '_scan_preset_dir') as scan:
+        IRConfig.register_preset_dir(tmp_path, persist=True)
+    assert scan.call_count == 0
+    assert IRConfig.load_preset('persisted.json') == {"test": 1}
+
+
+def test_persisted_preset_index_outdated(tmp_path):
+    os.makedirs(tmp_path / 'sub')
+    with open(tmp_path / 'sub' / 'removed.json', 'w') as f:
+        json.dump({"test": 1}, f)
+    IRConfig.register_preset_dir(tmp_path, persist=True)
+    assert IRConfig.load_preset('sub/removed.json') == {"test": 1}
+
+    # a later launch
+    with open(tmp_path / 'sub' / 'added.json', 'w') as f:
+        json.dump({"test": 2}, f)
+    os.remove(tmp_path / 'sub' / 'removed.json')
+    IRConfig.preset_index = {}
+    IRConfig.register_preset_dir(tmp_path, persist=True)
+    assert IRConfig.load_preset('sub/added.json') == {"test": 2}
+    with pytest.raises(ValueError):
+        IRConfig.load_preset('sub/removed.json')
+
+    with open(tmp_path / 'added.json', 'w') as f:
+        json.dump({"test": 3}, f)
+    IRConfig.preset_index = {}
+    IRConfig.register_preset_dir(tmp_path, persist=True)
+    assert IRConfig.load_preset('added.json') == {"test": 3}
+
+
+def test_preset_removed(tmp_path):
+    with open(tmp_path / 'removed.json', 'w') as f:
+        json.dump({"test": 1}, f)
+    IRConfig.register_preset_dir(tmp_path)
+    os.remove(tmp_path / 'removed.json')
+    with pytest.raises(ValueError):
+        IRConfig.load_preset('removed.json')
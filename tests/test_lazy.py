@@ -0,0 +1,115 @@
+from typeconf import BaseConfig, SelectConfig
+from pydantic import ValidationError, validator, root_validator
+from typing import Optional
+import pytest
+
+
+class LazySelectConfig(SelectConfig):
+    pass
+
+
+@LazySelectConfig.register('option1')
+class LazyOption1Config(LazySelectConfig):
+    test : int = 1
+
+
+class NestedConfig(BaseConfig):
+    test : int = 1
+
+
+class LazyConfig(BaseConfig):
+    test : int = 1
+    nested : NestedConfig
+    optional : Optional[NestedConfig]
+    select : LazySelectConfig
+
+    class Config:
+        lazy = True
+
+
+def test_lazy():
+    cfg = LazyConfig(**{"nested": {"test": 2}, "select": {"name": "option1"}})
+    assert cfg.__dict__['nested'] == {"test": 2}
+    assert cfg.nested.test == 2
+    assert isinstance(cfg.__dict__['nested'], NestedConfig)
+    assert isinstance(cfg.select, LazyOption1Config)
+    assert cfg.optional is None
+    assert cfg.get_stats() == {'nested': 1, 'nested.test': 1, 'select': 1, 'optional': 1}
+
+
+def test_lazy_error():
+    cfg = LazyConfig(**{"nested": {"test": "x"}, "select": {"name": "option1"}})
+    assert cfg.test == 1
+    with pytest.raises(ValidationError):
+        cfg.nested
+    with pytest.raises(ValidationError):
+        cfg.validate_all()
+
+
+def test_lazy_required():
+    with pytest.raises(ValidationError):
+        LazyConfig(**{"select": {"name": "option1"}})
+    with pytest.raises(ValidationError):
+        LazyConfig(**{"nested": {}, "select": {"name": "option1"}, "test": "x"})
+
+
+def test_lazy_instance():
+    cfg = LazyConfig(**{"nested": NestedConfig(test=3), "select": {"name": "option1"}})
+    assert isinstance(cfg.__dict__['nested'], NestedConfig)
+    with pytest.raises(ValidationError):
+        LazyConfig(**{"nested": LazyOption1Config(name="option1"), "select": {"name": "option1"}})
+
+
+def test_validate_all():
+    cfg = LazyConfig(**{"nested": {"test": 2}, "select": {"name": "option1", "test": 3}})
+    cfg.validate_all()
+    assert cfg.get_stats() == {}
+    assert isinstance(cfg.__dict__['nested'], NestedConfig)
+    assert isinstance(cfg.__dict__['select'], LazyOption1Config)
+
+
+def test_lazy_reused_dict():
+    base = {"nested": {"test": 0}, "select": {"name": "option1"}}
+    cfgs = []
+    for i in range(3):
+        base["nested"]["test"] = i
+        cfgs.append(LazyConfig(**base))
+    assert [cfg.nested.test for cfg in cfgs] == [0, 1, 2]
+
+
+def test_lazy_copy():
+    cfg = LazyConfig(**{"nested": {"test": 5}, "select": {"name": "option1"}})
+    copied = cfg.copy()
+    assert cfg.nested.test == 5
+    assert isinstance(copied.nested, NestedConfig)
+    assert copied.nested.test == 5
+
+
+class ValidatedLazyConfig(BaseConfig):
+    nested : NestedConfig
+    limit : int = 5
+
+    @validator('nested')
+    def positive(cls, nested):
+        assert nested.test > 0
+        return nested
+
+    @root_validator
+    def below_limit(cls, values):
+        assert values['nested'].test < values['limit']
+        return values
+
+    class Config:
+        lazy = True
+
+
+def test_lazy_validators():
+    cfg = ValidatedLazyConfig(nested={"test": 2})
+    assert isinstance(cfg.nested, NestedConfig)
+    with pytest.raises(ValidationError):
+        ValidatedLazyConfig(nested={"test": -1}).nested
+    cfg = ValidatedLazyConfig(nested={"test": 7})
+    with pytest.raises(ValidationError):
+        cfg.validate_all()
+    with pytest.raises(ValidationError):
+        ValidatedLazyConfig(nested=NestedConfig(test=7))
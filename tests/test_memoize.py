@@ -0,0 +1,61 @@
+from typeconf import BaseConfig, memoize_build
+import gc
+
+
+class Model(object):
+    def __init__(self, size):
+        self.size = size
+
+
+class ModelConfig(BaseConfig):
+    size : int = 1
+
+    @memoize_build(maxsize=4)
+    def build(self, scale=1):
+        return Model(self.size * scale)
+
+
+class WeakModelConfig(BaseConfig):
+    size : int = 1
+
+    @memoize_build(weak=True)
+    def build(self):
+        return Model(self.size)
+
+
+def test_memoize():
+    ModelConfig.build.cache_clear()
+    model = ModelConfig(size=2).build()
+    assert ModelConfig(size=2).build() is model
+    assert ModelConfig(size=2).build(scale=2) is not model
+    assert ModelConfig(size=3).build() is not model
+    info = ModelConfig.build.cache_info()
+    assert info.hits == 1
+    assert info.misses == 3
+
+
+def test_lru():
+    ModelConfig.build.cache_clear()
+    model = ModelConfig(size=0).build()
+    for size in range(1, 5):
+        ModelConfig(size=size).build()
+    assert ModelConfig(size=0).build() is not model
+    assert ModelConfig.build.cache_info().currsize == 4
+
+
+def test_weak():
+    WeakModelConfig.build.cache_clear()
+    model = WeakModelConfig().build()
+    assert WeakModelConfig().build() is model
+    del model
+    gc.collect()
+    WeakModelConfig().build()
+    info = WeakModelConfig.build.cache_info()
+    assert info.hits == 1
+    assert info.misses == 2
+
+
+def test_unhashable():
+    ModelConfig.build.cache_clear()
+    ModelConfig().build(scale=[1])
+    assert ModelConfig.build.cache_info().misses == 0
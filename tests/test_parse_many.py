@@ -0,0 +1,70 @@
+from typeconf import BaseConfig, SelectConfig
+from pydantic import ValidationError
+
+
+class ManySelectConfig(SelectConfig):
+    pass
+
+
+@ManySelectConfig.register('option1')
+class ManyOption1Config(ManySelectConfig):
+    test : int = 1
+
+
+@ManySelectConfig.register('option2')
+class ManyOption2Config(ManySelectConfig):
+    test : int = 2
+
+
+class ManyConfig(BaseConfig):
+    test : int
+    select : ManySelectConfig
+
+
+class PlainConfig(BaseConfig):
+    test : int
+    other : str = "a"
+
+
+def test_parse_many():
+    items = [
+        {"test": 1, "select": {"name": "option1"}},
+        {"test": 2, "select": {"name": "option2"}},
+        {"test": "x", "select": {"name": "option1"}},
+        {"test": 3, "select": {"name": "unknown"}},
+        {"test": 4, "select": {"name": "option1", "test": 5}},
+    ]
+    results = list(ManyConfig.parse_many(items))
+    assert len(results) == 5
+    assert results[0].test == 1
+    assert isinstance(results[1].select, ManyOption2Config)
+    assert isinstance(results[2], ValidationError)
+    assert isinstance(results[3], ValueError)
+    assert results[4].select.test == 5
+    assert type(results[0]) is type(results[4])
+
+
+def test_parse_many_streaming():
+    def items():
+        yield {"test": 1}
+        raise RuntimeError("consumed too early")
+
+    results = PlainConfig.parse_many(items())
+    assert next(results).test == 1
+
+
+def test_parse_many_workers():
+    items = [{"test": i} for i in range(50)] + [{"test": "x"}]
+    results = list(PlainConfig.parse_many(items, workers=2, chunksize=4))
+    assert [r.test for r in results[:-1]] == list(range(50))
+    assert isinstance(results[-1], ValidationError)
+
+
+def test_parse_many_workers_errors():
+    items = [{"test": 1, "select": {"name": "option1"}},
+             {"test": "x", "select": {"name": "option2", "test": "y"}}]
+    results = list(ManyConfig.parse_many(items, workers=1))
+    assert results[0].select.test == 1
+    assert isinstance(results[1], ValidationError)
+    assert results[1].model is ManyConfig
+    assert [e['loc'] for e in results[1].errors()] == [('test', ), ('select', 'test')]
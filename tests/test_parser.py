@@ -202,3 +202,107 @@ def test_overwrite_preset():
     parser.add_subparser(subparser, 'nested')
     args = parser.parse_args(['--nested.test', '2', '--nested', '${preset:test}'])
     args = parser.parse_args(['--nested', '${preset:test}', '--nested.test', '2'])
+
+
+def test_spec():
+    from typeconf import BaseConfig, SelectConfig
+    from typing import List
+
+    class ParentConfig(SelectConfig):
+        pass
+
+    class NestedConfig(BaseConfig):
+        test : List[int]
+
+    class Config(BaseConfig):
+        test : int
+        nested : NestedConfig
+        select : ParentConfig
+
+    parser = Parser.from_config(Config)
+    spec = parser.to_spec()
+    restored = Parser.from_spec(spec)
+    assert restored.to_spec() == spec
+    args = ['--test', '1', '--nested.test', '1', '2', '--select.name', 'a']
+    assert restored.parse_args(args) == parser.parse_args(args)
+
+
+def test_cached_parser(tmp_path):
+    import unittest.mock
+    from typeconf import BaseConfig
+
+    class Config(BaseConfig):
+        test : int
+
+    Parser.from_config_cached(Config, str(tmp_path))
+    assert len(list(tmp_path.iterdir())) == 1
+    with unittest.mock.patch.object(Parser, 'from_config') as from_config:
+        cached = Parser.from_config_cached(Config, str(tmp_path))
+    assert from_config.call_count == 0
+    assert cached.parse_args(['--test', '1']) == {'test': '1'}
+
+
+def test_cached_parser_unwritable(tmp_path):
+    from typeconf import BaseConfig
+
+    class Config(BaseConfig):
+        test : int
+
+    # a file where the directory should be
+    cache_dir = tmp_path / 'file'
+    cache_dir.write_text('')
+    parser = Parser.from_config_cached(Config, str(cache_dir / 'cache'))
+    assert parser.parse_args(['--test', '1']) == {'test': '1'}
+
+
+def test_fingerprint():
+    from typeconf import BaseConfig
+    from typeconf.cli import schema_fingerprint
+
+    class Config1(BaseConfig):
+        pass
+
+    class Config2(BaseConfig):
+        pass
+
+    assert schema_fingerprint(Config1) == schema_fingerprint(Config1)
+    assert schema_fingerprint(Config1) != schema_fingerprint(Config2)
+
+
+def test_flat_table():
+    from typeconf import BaseConfig, SelectConfig
+
+    class ParentConfig(SelectConfig):
+        pass
+
+    class NestedNestedConfig(BaseConfig):
+        test : int
+
+    class NestedConfig(BaseConfig):
+        nested : NestedNestedConfig
+        select : ParentConfig
+
+    class Config(BaseConfig):
+        nested : NestedConfig
+
+    parser = Parser.from_config(Config)
+    table, dynamic = parser._compile()
+    assert 'nested.nested.test' in table
+    assert dynamic == {'nested.select'}
+    args = parser.parse_args(['--nested.nested.test', '1', '--nested.select.a.b', '2', '3'])
+    assert args == {'nested': {'nested': {'test': '1'}, 'select': {'a': {'b': ['2', '3']}}}}
+    with pytest.raises(ValueError):
+        parser.parse_args(['--nested.unknown', '1'])
+
+
+def test_many_overrides():
+    parser = Parser()
+    for i in range(500):
+        subparser = Parser()
+        subparser.add_argument('--test')
+        parser.add_subparser(subparser, 'nested%d' % i)
+    args = []
+    for i in range(500):
+        args.extend(['--nested%d.test' % i, str(i)])
+    result = parser.parse_args(args)
+    assert result['nested499'] == {'test': '499'}
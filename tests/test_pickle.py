@@ -0,0 +1,48 @@
+from typeconf import BaseConfig, SelectConfig
+from typeconf.irconfig import IRConfig
+import unittest.mock
+import pickle
+import copy
+
+
+class PickleSelectConfig(SelectConfig):
+    pass
+
+
+@PickleSelectConfig.register('option1')
+class PickleOption1Config(PickleSelectConfig):
+    test : int = 1
+
+
+class NestedConfig(BaseConfig):
+    test : int = 1
+
+
+class PickleConfig(BaseConfig):
+    nested : NestedConfig
+    select : PickleSelectConfig
+
+
+def test_pickle():
+    cfg = PickleConfig(**{"nested": {"test": 2}, "select": {"name": "option1", "test": 3}})
+    with unittest.mock.patch.object(IRConfig, 'resolve_container') as resolve:
+        restored = pickle.loads(pickle.dumps(cfg))
+    assert resolve.call_count == 0
+    assert type(restored) is type(cfg)
+    assert restored == cfg
+    assert restored.select.test == 3
+    assert isinstance(restored.select, PickleOption1Config)
+
+
+def test_deepcopy():
+    cfg = PickleConfig(**{"nested": {"test": 2}, "select": {"name": "option1"}})
+    copied = copy.deepcopy(cfg)
+    assert copied == cfg
+    assert copied.nested is not cfg.nested
+
+
+def test_parse_many_workers():
+    items = [{"nested": {"test": i}, "select": {"name": "option1"}} for i in range(10)]
+    results = list(PickleConfig.parse_many(items, workers=2, chunksize=2))
+    assert [r.nested.test for r in results] == list(range(10))
+    assert all(isinstance(r.select, PickleOption1Config) for r in results)
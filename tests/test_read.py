@@ -17,3 +17,125 @@ def test_torch_config():
     import torch
     cfg = read_file_cfg('tests/configs/torch.py')
     assert cfg['nonlinearity'] == torch.relu
+
+
+def test_yaml_config(tmp_path):
+    path = tmp_path / 'config.yaml'
+    path.write_text("test1: 1\nnested:\n  test2: [1, 2]\n")
+    cfg = read_file_cfg(str(path))
+    assert cfg == {"test1": 1, "nested": {"test2": [1, 2]}}
+
+
+def test_yaml_fallback(tmp_path, monkeypatch):
+    import yaml
+    from typeconf.utils import yaml_backend
+    path = tmp_path / 'config.yml'
+    path.write_text("test1: 1\n")
+    monkeypatch.delattr(yaml, 'CSafeLoader', raising=False)
+    assert yaml_backend() == 'python'
+    assert read_file_cfg(str(path)) == {"test1": 1}
+
+
+def test_py_bytecode_cache(tmp_path, monkeypatch):
+    import builtins
+    import unittest.mock
+    from typeconf import utils
+    path = tmp_path / 'config.py'
+    path.write_text("cfg = {'layers': [i for i in range(3)]}\n")
+
+    assert read_file_cfg(str(path)) == {'layers': [0, 1, 2]}
+    with unittest.mock.patch.object(builtins, 'compile', wraps=builtins.compile) as compile_:
+        assert read_file_cfg(str(path)) == {'layers': [0, 1, 2]}
+    assert compile_.call_count == 0
+    assert not (tmp_path / '__pycache__').exists()
+
+    monkeypatch.setattr(utils, 'write_bytecode', True)
+    monkeypatch.setattr('sys.dont_write_bytecode', False)
+    utils._code_cache.clear()
+    read_file_cfg(str(path))
+    assert len(list((tmp_path / '__pycache__').iterdir())) == 1
+
+    # loaded from the marshal file
+    utils._code_cache.clear()
+    with unittest.mock.patch.object(builtins, 'compile', wraps=builtins.compile) as compile_:
+        assert read_file_cfg(str(path)) == {'layers': [0, 1, 2]}
+    assert compile_.call_count == 0
+
+    # source changed
+    path.write_text("cfg = {'layers': []}\n")
+    assert read_file_cfg(str(path)) == {'layers': []}
+
+
+def test_iter_jsonl(tmp_path):
+    from typeconf import iter_file_cfgs
+    path = tmp_path / 'configs.jsonl'
+    path.write_text('{"test": 1}\n\n{"test": 2}\n')
+    cfgs = iter_file_cfgs(str(path))
+    assert next(cfgs) == {"test": 1}
+    assert list(cfgs) == [{"test": 2}]
+
+
+def test_iter_yaml(tmp_path):
+    from typeconf import iter_file_cfgs
+    path = tmp_path / 'configs.yaml'
+    path.write_text('test: 1\n---\ntest: 2\n---\n')
+    assert list(iter_file_cfgs(str(path))) == [{"test": 1}, {"test": 2}]
+
+
+def test_iter_construct(tmp_path):
+    from typeconf import iter_file_cfgs, BaseConfig
+
+    class Config(BaseConfig):
+        test : int
+
+    path = tmp_path / 'configs.jsonl'
+    path.write_text('{"test": 1}\n{"test": 2}\n')
+    assert [cfg.test for cfg in Config.parse_many(iter_file_cfgs(str(path)))] == [1, 2]
+
+    path = tmp_path / 'config.json'
+    path.write_text('{"test": 3}')
+    assert [cfg.test for cfg in Config.parse_many(iter_file_cfgs(str(path)))] == [3]
+
+
+def test_json_backends(tmp_path):
+    import json
+    import pytest
+    from typeconf import utils
+    path = tmp_path / 'config.json'
+    path.write_text('{"nan": NaN, "big": 123456789012345678901234567890, "text": "\\u00e4"}')
+    results = []
+    for backend in ('json', 'orjson'):
+        utils.set_json_backend(backend)
+        try:
+            results.append(read_file_cfg(str(path)))
+        finally:
+            utils.set_json_backend(None)
+    assert results[0]['big'] == results[1]['big']
+    assert results[0]['text'] == results[1]['text']
+
+    path.write_text('{"broken": ')
+    with pytest.raises(json.JSONDecodeError):
+        read_file_cfg(str(path))
+    with pytest.raises(ValueError):
+        utils.set_json_backend('unknown')
+
+
+def test_json_benchmark(tmp_path):
+    import json
+    import timeit
+    import pytest
+    from typeconf import utils
+    pytest.importorskip('orjson')
+    cfg = {"weights": {"class%d" % i: [i * 0.5] * 20 for i in range(20000)}}
+    path = tmp_path / 'config.json'
+    path.write_text(json.dumps(cfg))
+
+    timings = {}
+    for backend in ('json', 'orjson'):
+        utils.set_json_backend(backend)
+        try:
+            assert read_file_cfg(str(path)) == cfg
+            timings[backend] = min(timeit.repeat(lambda: read_file_cfg(str(path)), number=1, repeat=3))
+        finally:
+            utils.set_json_backend(None)
+    assert timings['orjson'] < timings['json']
@@ -0,0 +1,72 @@
+from typeconf import BaseConfig, SelectConfig
+from typeconf.__main__ import main
+from typeconf.report import build_index, unused_fields
+import json
+
+
+class ReportSelectConfig(SelectConfig):
+    pass
+
+
+@ReportSelectConfig.register('option1')
+class ReportOption1Config(ReportSelectConfig):
+    test : int = 1
+    other : int = 2
+
+
+@ReportSelectConfig.register('option2')
+class ReportOption2Config(ReportSelectConfig):
+    test : int = 1
+
+
+class ReportConfig(BaseConfig):
+    test : int = 1
+    rare : int = 2
+    select : ReportSelectConfig
+
+
+def write_dumps(path, n):
+    for i in range(n):
+        option = 'option1' if i % 2 else 'option2'
+        cfg = ReportConfig(select={"name": option})
+        cfg.test
+        cfg.select.test
+        if i == 0:
+            cfg.rare
+        cfg.dump_stats(str(path / f'run{i}.json'))
+
+
+def test_dump_stats(tmp_path):
+    cfg = ReportConfig(select={"name": "option1"})
+    cfg.select.test
+    cfg.dump_stats(str(tmp_path / 'stats.json'))
+    with open(tmp_path / 'stats.json') as f:
+        dump = json.load(f)
+    assert dump['schema'] == __name__ + '.ReportConfig'
+    fields = {entry['path']: entry for entry in dump['fields']}
+    assert fields['select.test']['count'] == 1
+    assert fields['select.test']['owner'] == __name__ + '.ReportOption1Config'
+    assert fields['select.test']['option'] == 'option1'
+    assert fields['select.other']['count'] == 0
+    assert fields['test']['option'] is None
+    assert 'select.name' not in fields
+
+
+def test_report(tmp_path):
+    write_dumps(tmp_path, 40)
+    index = build_index([str(tmp_path)])
+    assert index == build_index([str(tmp_path)], workers=2, chunksize=3)
+    report = unused_fields(index, rare=0.05)[__name__ + '.ReportConfig']
+    never = {(e['option'], e['field']) for e in report['never']}
+    assert never == {('option1', 'other')}
+    assert [(e['field'], e['used'], e['runs']) for e in report['rarely']] == [('rare', 1, 40)]
+
+
+def test_command(tmp_path, capsys):
+    write_dumps(tmp_path, 2)
+    main(['stats', str(tmp_path)])
+    out = capsys.readouterr().out
+    assert __name__ + '.ReportOption1Config[option1].other  0/1 runs' in out
+    main(['stats', '--json', str(tmp_path)])
+    report = json.loads(capsys.readouterr().out)
+    assert report[__name__ + '.ReportConfig']['rarely'] == []
@@ -226,3 +226,60 @@ def test_alias():
     cls = ParentConfig.build_config({'name': 'child2'})
     assert cls == ChildConfig
 
+
+
+LAZY_OPTION = '''
+from {module} import LazyMasterConfig
+
+@LazyMasterConfig.register('lazy')
+class LazyOptionConfig(LazyMasterConfig):
+    test : int = 1
+'''
+
+
+class LazyMasterConfig(SelectConfig):
+    pass
+
+
+def test_register_lazy(tmp_path, monkeypatch):
+    import sys
+    (tmp_path / 'lazy_option.py').write_text(LAZY_OPTION.format(module=__name__))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    LazyMasterConfig.register_lazy('Lazy', 'lazy_option.LazyOptionConfig')
+    assert 'lazy_option' not in sys.modules
+    config = LazyMasterConfig(name='lazy', test=2)
+    assert 'lazy_option' in sys.modules
+    from lazy_option import LazyOptionConfig
+    assert isinstance(config, LazyOptionConfig)
+    assert config.test == 2
+    assert LazyMasterConfig.build_config({'name': 'lazy'}) is LazyOptionConfig
+    # registering again is fine
+    LazyMasterConfig.register_lazy('lazy', 'lazy_option.LazyOptionConfig')
+    with pytest.raises(ValueError):
+        LazyMasterConfig.register_lazy('lazy', 'lazy_option.OtherConfig')
+    monkeypatch.delitem(sys.modules, 'lazy_option')
+
+
+def test_register_lazy_undecorated(tmp_path, monkeypatch):
+    (tmp_path / 'lazy_plain.py').write_text(
+        LAZY_OPTION.format(module=__name__).replace("@LazyMasterConfig.register('lazy')", ""))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    LazyMasterConfig.register_lazy('plain', 'lazy_plain.LazyOptionConfig')
+    config = LazyMasterConfig(name='plain')
+    assert type(config).__name__ == 'LazyOptionConfig'
+    monkeypatch.delitem(__import__('sys').modules, 'lazy_plain')
+
+
+def test_register_lazy_libs():
+    import subprocess
+    import sys
+    code = (
+        "import sys\n"
+        "from typeconf.libs.torch.optim import OptimizerConfig\n"
+        "assert 'typeconf.libs.torch.optim.adagrad' not in sys.modules\n"
+        "config = OptimizerConfig(name='Adagrad')\n"
+        "from typeconf.libs.torch.optim import AdagradConfig\n"
+        "assert isinstance(config, AdagradConfig)\n"
+        "assert 'typeconf.libs.torch.optim.adadelta' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, '-c', code], check=True)
@@ -1,4 +1,6 @@
-from typeconf import BaseConfig
+import pytest
+import json
+from typeconf import BaseConfig, SelectConfig
 
 
 class Config(BaseConfig):
@@ -59,3 +61,190 @@ def test_access():
     assert cfg.nested.test == 2
     assert cfg['nested']['test'] == 2
 
+
+
+def test_per_instance():
+    cfg1 = Config()
+    cfg2 = Config()
+    cfg1.test
+    assert cfg1.get_stats() == {'test': 1}
+    assert cfg2.get_stats() == {}
+
+
+class UntrackedConfig(BaseConfig):
+    test : int = 1
+
+    class Config:
+        track_access = 'off'
+
+
+def test_off():
+    cfg = UntrackedConfig()
+    cfg.test
+    assert cfg.get_stats() == {}
+    assert UntrackedConfig.__getattribute__ is object.__getattribute__
+
+
+class FirstConfig(BaseConfig):
+    test : int = 1
+
+    class Config:
+        track_access = 'first'
+
+
+def test_first():
+    cfg = FirstConfig()
+    cfg.test
+    cfg.test
+    assert cfg.get_stats() == {'test': 1}
+    assert cfg.find_unused() == set()
+
+
+def test_global_off():
+    BaseConfig.set_access_tracking('off')
+    try:
+        cfg = Config2()
+        cfg.nested.test
+        assert cfg.get_stats() == {}
+        # own setting is kept
+        cfg = FirstConfig()
+        cfg.test
+        assert cfg.get_stats() == {'test': 1}
+    finally:
+        BaseConfig.set_access_tracking('count')
+    cfg = Config2()
+    cfg.nested.test
+    assert cfg.get_stats() == {'nested': 1, 'nested.test': 1}
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        Config.set_access_tracking('unknown')
+
+
+def test_find_unused_nested():
+    cfg = Config3()
+    assert cfg.find_unused() == {'nested', 'nested.nested', 'nested.nested.test'}
+    cfg.nested.nested
+    assert cfg.find_unused() == {'nested.nested.test'}
+    assert cfg.nested.find_unused() == {'nested.test'}
+
+
+def test_stats_snapshot():
+    cfg = Config2()
+    cfg.nested.test
+    stats = cfg.get_stats()
+    cfg.nested.test
+    assert stats == {'nested': 1, 'nested.test': 1}
+    assert cfg.nested.get_stats() == {'test': 2}
+    assert cfg.nested._stats is cfg._stats
+
+
+def test_stats_assigned():
+    cfg = Config2()
+    nested = Config(test=3)
+    nested.test
+    cfg.nested = nested
+    assert cfg.get_stats() == {'nested.test': 1}
+    cfg.nested.test
+    assert cfg.get_stats() == {'nested': 1, 'nested.test': 2}
+
+
+def test_stats_evolve():
+    cfg = Config3()
+    variant = cfg.evolve(**{"nested.nested.test": 3})
+    variant.nested.nested.test
+    assert variant.get_stats() == {'nested': 1, 'nested.nested': 1, 'nested.nested.test': 1}
+    assert cfg.get_stats() == {}
+    assert 'nested.nested.test' in cfg.find_unused()
+
+
+class FrozenConfig(BaseConfig):
+    test : int = 2
+
+    class Config:
+        allow_mutation = False
+
+
+class FrozenParentConfig(BaseConfig):
+    test : int = 1
+    leaf : FrozenConfig = FrozenConfig()
+
+
+def test_stats_evolve_frozen():
+    cfg = FrozenParentConfig()
+    variant = cfg.evolve(test=2)
+    variant.leaf.test
+    assert variant.get_stats() == {'leaf': 1, 'leaf.test': 1}
+    assert cfg.get_stats() == {}
+    assert 'leaf.test' in cfg.find_unused()
+    assert 'leaf.test' not in variant.find_unused()
+    assert cfg.evolve(test=3).find_unused() == {'test', 'leaf', 'leaf.test'}
+
+
+class StatsSelectConfig(SelectConfig):
+    pass
+
+
+@StatsSelectConfig.register('option1')
+class StatsOption1Config(StatsSelectConfig):
+    test : int = 1
+
+
+class SelectParentConfig(BaseConfig):
+    opt : StatsSelectConfig
+
+
+def test_unused_select_name():
+    cfg = SelectParentConfig(opt={"name": "option1"})
+    assert cfg.find_unused() == {'opt', 'opt.test'}
+    cfg.opt.test
+    assert cfg.find_unused() == set()
+
+
+def test_stats_copied():
+    nested = Config()
+    nested.test
+    cfg1 = Config2(nested=nested)
+    cfg2 = Config2(nested=nested)
+    cfg1.nested.test
+    assert cfg1.get_stats() == {'nested': 1, 'nested.test': 1}
+    assert cfg2.get_stats() == {}
+    assert nested.get_stats() == {'test': 1}
+
+
+def test_access_log(tmp_path):
+    from typeconf.stats import read_access_log
+    import json
+    path = str(tmp_path / 'access.jsonl')
+    cfg = Config2()
+    log = cfg.log_access(path, interval=60)
+    cfg.nested.test
+    cfg.nested.test
+    log.write()
+    cfg.nested.test
+    log.close()
+    with open(path) as f:
+        records = [json.loads(line) for line in f]
+    assert len(records) == 2
+    assert set(records[0]['first']) == {'nested', 'nested.test'}
+    assert records[0]['counts'] == {'nested': 2, 'nested.test': 2}
+    assert records[1]['first'] == {}
+    assert records[1]['counts'] == {'nested': 1, 'nested.test': 1}
+    summary = read_access_log(path)
+    assert summary['nested.test']['count'] == 3
+    assert summary['nested.test']['last'] == records[1]['time']
+    assert cfg._stats.log is None
+
+
+def test_access_log_bounded(tmp_path):
+    path = str(tmp_path / 'access.jsonl')
+    cfg = Config4()
+    with cfg.log_access(path, interval=60, buffer_size=1):
+        cfg.test1
+        cfg.test2
+    with open(path) as f:
+        record = json.loads(f.read())
+    assert list(record['first']) == ['test1']
+    assert record['dropped'] == 1
+    assert record['counts'] == {'test1': 1, 'test2': 1}
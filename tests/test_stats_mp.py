@@ -0,0 +1,93 @@
+from typeconf import BaseConfig
+from typeconf.stats import flush_stats
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import os
+import pickle
+import pytest
+
+
+posix_only = pytest.mark.skipif(not hasattr(os, 'fork'), reason="needs fork")
+
+
+class ChildConfig(BaseConfig):
+    test : int = 1
+    other : int = 2
+
+
+class ParentConfig(BaseConfig):
+    child : ChildConfig = ChildConfig()
+    unused : int = 3
+
+
+def read_child(cfg):
+    return cfg.child.test
+
+
+def read_nested(child):
+    return child.test
+
+
+def test_process_pool(tmp_path):
+    cfg = ParentConfig()
+    cfg.collect_stats(str(tmp_path))
+    with ProcessPoolExecutor(2) as pool:
+        assert list(pool.map(read_child, [cfg] * 4)) == [1] * 4
+        assert pool.submit(read_nested, cfg.child).result() == 1
+    stats = cfg.get_stats()
+    assert stats['child.test'] == 5
+    # once in the parent
+    assert stats['child'] == 5
+    assert cfg.find_unused() == {'unused', 'child.other'}
+    # merged once
+    assert cfg.get_stats() == stats
+    assert os.listdir(tmp_path) == []
+
+
+@posix_only
+def test_fork(tmp_path):
+    cfg = ParentConfig()
+    cfg.collect_stats(str(tmp_path))
+    cfg.child.test
+    ctx = multiprocessing.get_context('fork')
+    process = ctx.Process(target=read_child, args=(cfg, ))
+    process.start()
+    process.join()
+    assert cfg.get_stats() == {'child': 2, 'child.test': 2}
+
+
+@posix_only
+def test_flush(tmp_path):
+    cfg = ParentConfig()
+    cfg.collect_stats(str(tmp_path))
+    pid = os.fork()
+    if pid == 0:
+        cfg.unused
+        flush_stats()
+        os._exit(0)
+    os.waitpid(pid, 0)
+    assert cfg.get_stats() == {'unused': 1}
+
+
+def test_pickle_local():
+    cfg = ParentConfig()
+    loaded = pickle.loads(pickle.dumps(cfg))
+    loaded.child.test
+    assert loaded.get_stats() == {'child': 1, 'child.test': 1}
+    assert cfg.get_stats() == {}
+
+
+def test_temporary_spool():
+    import subprocess
+    import sys
+    code = (
+        "from typeconf import BaseConfig\n"
+        "class Config(BaseConfig):\n"
+        "    test : int = 1\n"
+        "spool = Config().collect_stats()\n"
+        "print(spool)\n"
+    )
+    spool = subprocess.run([sys.executable, '-c', code], check=True,
+                           stdout=subprocess.PIPE, universal_newlines=True).stdout.strip()
+    # removed at exit
+    assert spool and not os.path.exists(spool)